@@ -1,94 +1,121 @@
+import os
+import sys
+from typing import Dict, List, Set
+
 from gameObjects.gameObjectRepository import GameObjectRepository
 from gameObjects.planet import Planet
 from gameObjects.traderoute import TradeRoute
 from gameObjects.campaign import Campaign
 from gameObjects.faction import Faction
 from gameObjects.aiplayer import AIPlayer
+from xmlUtil.loadprofiler import LoadProfiler
+from xmlUtil.recordcache import RecordCache
 from xmlUtil.xmlreader import XMLReader
 from xmlUtil.xmlstructure import XMLStructure
 
+class LoadCancelled(Exception):
+    '''Raised inside a load once its isCancelled callback returns True'''
+    pass
+
+
 class RepositoryCreator:
     '''Creates a Repository of GameObjects from input XMLs'''
-    def __init__(self):
+    def __init__(self, workers: int = 1, useCache: bool = True, profiler: LoadProfiler = None):
+        '''workers sets how many files are parsed concurrently while loading. 1 loads serially.
+        useCache keeps the records extracted from unchanged files between runs.
+        profiler, if given and enabled, measures every load'''
         self.repository: GameObjectRepository = GameObjectRepository()
         self.__folder: str = ""
-        self.__xml: XMLReader = XMLReader()
-
-    def getNamesRootsFromXML(self, rootsList, tag: str) -> list:
-        '''Takes a list of XML roots and a tag to search for
-        and returns the Names and Roots of GameObjects in the list'''
-        names = []
-        roots = []
-
-        for root in rootsList:
-            names.extend(self.__xml.getNamesFromXML(root))
-            roots.extend(root.iter(tag))
-
-        return names, roots
-            
-    def addPlanetsFromXML(self, planetFilesAndRoots) -> None:
-        '''Takes a list of Planet GameObject XML roots and adds
-        them to the repository with x and y positions'''
-        for file, planetRoot in planetFilesAndRoots.items():
-            planetNames = self.__xml.getNamesFromXML(planetRoot)
-
-            for name in planetNames:
-                newplanet = Planet(name)
-                newplanet.containingFile = file
-                newplanet.variantOf = self.__xml.getVariantOfValue(name, planetRoot)
-                coordinates = self.__xml.getLocation(name, planetRoot)
-                if coordinates == None:
-                    newplanet.x, newplanet.y = None, None
-                else:
-                    newplanet.x, newplanet.y = coordinates
+        self.__workers: int = workers
+        self.__profiler: LoadProfiler = profiler if profiler is not None else LoadProfiler(False)
+        self.__xml: XMLReader = XMLReader(workers, self.__profiler)
+        self.__useCache: bool = useCache
+        self.__cache: RecordCache = None
+        self.__planetFiles: list = []
+        #Meta file and records per file for each kind of game object, kept so single files can be reloaded
+        self.__metaFiles: Dict[str, str] = {}
+        self.__fileRecords: Dict[str, dict] = {}
+        #Planet files, meta files and records of the last repository returned by loadRepository, until it is swapped in
+        self.__loadedPlanetFiles: list = []
+        self.__loadedMetaFiles: Dict[str, str] = {}
+        self.__loadedFileRecords: Dict[str, dict] = {}
+        self.__progress = None
+        self.__isCancelled = None
+
+    def addPlanetsFromRecords(self, planetRecords) -> None:
+        '''Takes a list of (name, coordinates, variantOf, containingFile) planet records
+        and adds them to the repository with x, y and z positions'''
+        for name, coordinates, variantOf, containingFile in planetRecords:
+            newplanet = Planet(self.__intern(name))
+            newplanet.containingFile = self.__intern(containingFile)
+            newplanet.variantOf = self.__intern(variantOf)
+            if coordinates is None:
+                newplanet.x, newplanet.y = None, None
+            else:
+                newplanet.x, newplanet.y, newplanet.z = coordinates
 
-                self.repository.addPlanet(newplanet)
+            self.repository.addPlanet(newplanet)
+
+        self.__profiler.count("planetsCreated", len(planetRecords))
         
-    def addTradeRoutesFromXML(self, tradeRouteRoots) -> None:
-        '''Takes a list of Trade Route GameObject XML roots and adds
-        them to the repository with start and end planets'''
-        for tradeRouteRoot in tradeRouteRoots:
-            tradeRouteNames = self.__xml.getNamesFromXML(tradeRouteRoot)
-
-            for name in tradeRouteNames:
-                newroute = TradeRoute(name)
-                newroute.start, newroute.end = self.__xml.getStartEnd(name, self.repository.planets, tradeRouteRoot)
-                self.repository.addTradeRoute(newroute)
+    def addTradeRoutesFromRecords(self, tradeRouteRecords) -> None:
+        '''Takes a list of (name, pointA, pointB) trade route records and adds
+        them to the repository with start and end planets. Routes to planets that do not exist are left out'''
+        for name, pointA, pointB in tradeRouteRecords:
+            start = self.__xml.getPlanet(pointA, self.repository)
+            end = self.__xml.getPlanet(pointB, self.repository)
+            if start is None or end is None:
+                continue
+
+            newroute = TradeRoute(self.__intern(name))
+            newroute.start = start
+            newroute.end = end
+            self.repository.addTradeRoute(newroute)
+
+        self.__profiler.count("tradeRoutesCreated", len(tradeRouteRecords))
+        self.__profiler.count("planetLookups", 2 * len(tradeRouteRecords))
     
-    def addFactionsFromXML(self, factionRoots) -> None:
-        '''Takes a list of Faction GameObject XML roots and adds
-        them to the repository'''
-        for factionRoot in factionRoots:
-            factionNames = self.__xml.getNamesFromXML(factionRoot)
-
-            for name in factionNames:
-                newfaction = Faction(name)
-                self.repository.addFaction(newfaction)
-
-    def addCampaignsFromXML(self, campaignNames, campaignRoots) -> None:
-        '''Takes a list of Campaign GameObject XML roots and their names, and adds
+    def addFactionsFromRecords(self, factionNames) -> None:
+        '''Takes a list of Faction names and adds them to the repository'''
+        for name in factionNames:
+            newfaction = Faction(self.__intern(name))
+            self.repository.addFaction(newfaction)
+
+        self.__profiler.count("factionsCreated", len(factionNames))
+
+    def addCampaignsFromRecords(self, campaignRecords) -> None:
+        '''Takes a list of (name, setName, planetNames, tradeRouteNames) campaign records and adds
         them to the repository, after finding their planets and trade routes'''
-        for (campaign, campaignRoot) in zip(campaignNames, campaignRoots):
-            newCampaignPlanets = set()
-            newCampaignTradeRoutes = set()
+        for name, setName, campaignPlanetNames, campaignTradeRouteNames in campaignRecords:
+            newCampaign = Campaign(self.__intern(name))
+            self.__fillCampaign(newCampaign, setName, campaignPlanetNames, campaignTradeRouteNames)
+            self.repository.addCampaign(newCampaign)
 
-            newCampaign = Campaign(campaign)
-            newCampaign.setName = self.__xml.getValueFromXMLRoot(campaignRoot, ".//Campaign_Set")
-            campaignPlanetNames = self.__xml.getListFromXMLRoot(campaignRoot, ".//Locations")
-            campaignTradeRouteNames = self.__xml.getListFromXMLRoot(campaignRoot, ".//Trade_Routes")
+        self.__profiler.count("campaignsCreated", len(campaignRecords))
 
-            for p in campaignPlanetNames:
-                newPlanet = self.__xml.getPlanet(p, self.repository.planets)
+    def __fillCampaign(self, campaign: Campaign, setName: str, campaignPlanetNames, campaignTradeRouteNames) -> None:
+        '''Sets the set name of a campaign and finds its planets and trade routes'''
+        newCampaignPlanets = set()
+        newCampaignTradeRoutes = set()
+
+        campaign.setName = self.__intern(setName)
+
+        #Names that are not found are reported by getPlanet and getTradeRoute and left out
+        for p in campaignPlanetNames:
+            newPlanet = self.__xml.getPlanet(p, self.repository)
+            if newPlanet is not None:
                 newCampaignPlanets.add(newPlanet)
 
-            for t in campaignTradeRouteNames:
-                newRoute = self.__xml.getPlanet(t, self.repository.tradeRoutes)
+        for t in campaignTradeRouteNames:
+            newRoute = self.__xml.getTradeRoute(t, self.repository)
+            if newRoute is not None:
                 newCampaignTradeRoutes.add(newRoute)
 
-            newCampaign.planets = newCampaignPlanets
-            newCampaign.tradeRoutes = newCampaignTradeRoutes
+        campaign.planets = newCampaignPlanets
+        campaign.tradeRoutes = newCampaignTradeRoutes
 
-            self.repository.addCampaign(newCampaign)
+        self.__profiler.count("planetLookups", len(campaignPlanetNames))
+        self.__profiler.count("tradeRouteLookups", len(campaignTradeRouteNames))
 
     def runPlanetVariantOfCheck(self) -> None:
         for planet in self.repository.planets:
@@ -96,6 +123,7 @@ class RepositoryCreator:
                 print(planet.name + " needs parent coordinates")
                 if planet.variantOf != "":
                     parent = self.getPlanetParentWithCoordinates(planet)
+                    self.__profiler.count("variantsResolved")
                     planet.x = parent.x
                     planet.y = parent.y
                     print(planet.name + " now uses " + parent.name + " coordinates!" + parent.x.__str__() + ", " + parent.y.__str__())
@@ -120,31 +148,378 @@ class RepositoryCreator:
 
 
 
+    def extractRecords(self, metaFile: str, extractor, requiredTag: str = None, phase: str = "") -> dict:
+        '''Returns a dictionary of file names and the records extractor(file, XMLRoot) returns for them,
+        for every file referenced in a metafile. Unchanged files are read from the load cache.
+        If requiredTag is given, files whose bytes do not contain that tag get no records and are not parsed'''
+        self.__reportProgress(phase, 0, 0, metaFile)
+        fileList = self.__xml.findMetaFileList(metaFile)
+        records = {}
+        staleFiles = []
+        done = 0
+
+        for file in fileList:
+            cachedRecords = None
+            if self.__cache is not None:
+                cachedRecords = self.__cache.getRecords(self.__xmlPath(file))
+                if cachedRecords is not None:
+                    self.__profiler.count("recordCacheHits")
+
+            if cachedRecords is None:
+                if requiredTag is not None and not self.__xml.mayContainTag(self.__xmlPath(file), requiredTag):
+                    cachedRecords = []
+                    if self.__cache is not None:
+                        self.__cache.setRecords(self.__xmlPath(file), cachedRecords)
+                else:
+                    staleFiles.append(file)
+
+            records[file] = cachedRecords
+            if cachedRecords is not None:
+                done += 1
+                self.__reportProgress(phase, done, len(fileList), file)
+
+        fileTrees = self.__xml.iterParseFiles([self.__xmlPath(file) for file in staleFiles])
+
+        for file, fileTree in zip(staleFiles, fileTrees):
+            done += 1
+            self.__reportProgress(phase, done, len(fileList), file)
+
+            if fileTree is None:
+                del records[file]
+                continue
+
+            records[file] = extractor(file, fileTree.getroot())
+            if self.__cache is not None:
+                self.__cache.setRecords(self.__xmlPath(file), records[file])
+
+        return records
+
+    def loadRepository(self, folder: str, progress = None, isCancelled = None) -> GameObjectRepository:
+        '''Reads a mod Data folder into a new repository and returns it, or None if the load was cancelled.
+        Neither the current repository nor XMLStructure are touched, so this can run on a worker thread
+        while the old data is still shown. progress(done, total, text) is called per phase and file,
+        isCancelled() is polled in between. Hand the result to swapInRepository to use it'''
+        loader = RepositoryCreator(self.__workers, self.__useCache, self.__profiler)
+        loader.__progress = progress
+        loader.__isCancelled = isCancelled
+
+        self.__profiler.reset()
+        try:
+            with self.__profiler.phase("total"):
+                loader.__load(folder)
+        except LoadCancelled:
+            return None
+
+        self.__loadedPlanetFiles = loader.__planetFiles
+        self.__loadedMetaFiles = loader.__metaFiles
+        self.__loadedFileRecords = loader.__fileRecords
+        return loader.repository
+
+    def swapInRepository(self, repository: GameObjectRepository, folder: str) -> GameObjectRepository:
+        '''Replaces the contents of the repository with a loaded one and points XMLStructure at its folder.
+        The repository object stays the same, so everyone holding it sees the new data. Call from the GUI thread'''
+        self.repository.takeContentsOf(repository)
+        self.__folder = folder
+        self.__metaFiles = self.__loadedMetaFiles
+        self.__fileRecords = self.__loadedFileRecords
+        XMLStructure.dataFolder = folder
+        XMLStructure.planetFiles = self.__loadedPlanetFiles
+        return self.repository
+
     def constructRepository(self, folder: str) -> GameObjectRepository:
         '''Reads a mod Data folder and searches the XML metafiles within
         Creates a repository with planets, trade routes and campaigns'''
-        self.__folder = folder
+        return self.swapInRepository(self.loadRepository(folder), folder)
 
-        XMLStructure.dataFolder = self.__folder
+    def __load(self, folder: str) -> None:
+        '''Fills the repository of a fresh RepositoryCreator from a mod Data folder'''
+        self.__folder = folder
 
-        gameObjectFile = self.__folder + "/XML/GameObjectFiles.XML"
-        campaignFile = self.__folder + "/XML/CampaignFiles.XML"
-        tradeRouteFile = self.__folder + "/XML/TradeRouteFiles.XML"
-        factionFile = self.__folder + "/XML/FactionFiles.XML"
+        self.__metaFiles = {
+            "planets": self.__folder + "/XML/GameObjectFiles.XML",
+            "tradeRoutes": self.__folder + "/XML/TradeRouteFiles.XML",
+            "factions": self.__folder + "/XML/FactionFiles.XML",
+            "campaigns": self.__folder + "/XML/CampaignFiles.XML"
+        }
         
-        XMLStructure.planetFiles = self.__xml.findPlanetsFiles(gameObjectFile).keys()
+        XMLReader.clearParseCache()
 
-        planetRoots = self.__xml.findPlanetsFiles(gameObjectFile)
-        tradeRouteRoots = self.__xml.findMetaFileRefs(tradeRouteFile)
-        factionRoots = self.__xml.findMetaFileRefs(factionFile)
-        
-        campaignRootList = self.__xml.findMetaFileRefs(campaignFile)
-
-        campaignNames, campaignRoots = self.getNamesRootsFromXML(campaignRootList, "Campaign")
-       
-        self.addPlanetsFromXML(planetRoots)
-        self.addTradeRoutesFromXML(tradeRouteRoots)
-        self.addFactionsFromXML(factionRoots)
-        self.addCampaignsFromXML(campaignNames, campaignRoots)
-        self.runPlanetVariantOfCheck()
-        return self.repository
\ No newline at end of file
+        self.__cache = None
+        if self.__useCache:
+            with self.__profiler.phase("loadRecordCache"):
+                self.__cache = RecordCache(self.__folder)
+                self.__cache.load()
+
+        with self.__profiler.phase("readPlanets"):
+            planetRecords = self.extractRecords(self.__metaFiles["planets"], self.__extractPlanetRecords, "Planet", "Planets")
+        with self.__profiler.phase("readTradeRoutes"):
+            tradeRouteRecords = self.extractRecords(self.__metaFiles["tradeRoutes"], self.__extractTradeRouteRecords, phase = "Trade routes")
+        with self.__profiler.phase("readFactions"):
+            factionRecords = self.extractRecords(self.__metaFiles["factions"], self.__extractFactionRecords, phase = "Factions")
+        with self.__profiler.phase("readCampaigns"):
+            campaignRecords = self.extractRecords(self.__metaFiles["campaigns"], self.__extractCampaignRecords, phase = "Campaigns")
+
+        if self.__cache is not None:
+            with self.__profiler.phase("saveRecordCache"):
+                self.__cache.save()
+
+        self.__fileRecords = {
+            "planets": planetRecords,
+            "tradeRoutes": tradeRouteRecords,
+            "factions": factionRecords,
+            "campaigns": campaignRecords
+        }
+
+        self.__planetFiles = [file for file, records in planetRecords.items() if len(records) > 0]
+
+        self.__reportProgress("Building repository", 0, 0, "")
+        with self.__profiler.phase("buildPlanets"):
+            for records in planetRecords.values():
+                self.addPlanetsFromRecords(records)
+
+        with self.__profiler.phase("buildTradeRoutes"):
+            for records in tradeRouteRecords.values():
+                self.addTradeRoutesFromRecords(records)
+
+        with self.__profiler.phase("buildFactions"):
+            for records in factionRecords.values():
+                self.addFactionsFromRecords(records)
+
+        with self.__profiler.phase("buildCampaigns"):
+            for records in campaignRecords.values():
+                self.addCampaignsFromRecords(records)
+
+        self.__reportProgress("Resolving planet variants", 0, 0, "")
+        with self.__profiler.phase("resolveVariants"):
+            self.runPlanetVariantOfCheck()
+
+    @property
+    def profiler(self) -> LoadProfiler:
+        return self.__profiler
+
+    def watchedFiles(self) -> List[str]:
+        '''Returns the meta files of the current data folder and every file they reference'''
+        paths = set(self.__metaFiles.values())
+        for records in self.__fileRecords.values():
+            paths.update(self.__xmlPath(file) for file in records)
+
+        return sorted(paths)
+
+    def reloadFile(self, path: str) -> Set[str]:
+        '''Reads one changed file of the current data folder again and applies the differences to the repository
+        in place. Returns which kinds of game objects changed ("planets", "tradeRoutes", "factions", "campaigns"),
+        or just "coordinates" if planets only moved. Returns None if a meta file changed, the folder has to be loaded again.
+        Only records that differ from the last read of the file are applied, edits to other objects are kept'''
+        key = self.__pathKey(path)
+        if key in (self.__pathKey(metaFile) for metaFile in self.__metaFiles.values()):
+            return None
+
+        extractors = {
+            "planets": self.__extractPlanetRecords,
+            "tradeRoutes": self.__extractTradeRouteRecords,
+            "factions": self.__extractFactionRecords,
+            "campaigns": self.__extractCampaignRecords
+        }
+        appliers = {
+            "planets": self.__applyPlanetRecords,
+            "tradeRoutes": self.__applyTradeRouteRecords,
+            "factions": self.__applyFactionRecords,
+            "campaigns": self.__applyCampaignRecords
+        }
+
+        changes = set()
+        for kind, records in self.__fileRecords.items():
+            for file in [file for file in records if self.__pathKey(self.__xmlPath(file)) == key]:
+                fileTree = self.__xml.parseFile(self.__xmlPath(file))
+                newRecords = []
+                if fileTree is not None:
+                    newRecords = extractors[kind](file, fileTree.getroot())
+
+                changes |= appliers[kind](records[file], newRecords)
+                records[file] = newRecords
+
+        if "planets" in changes:
+            XMLStructure.planetFiles = [file for file, records in self.__fileRecords["planets"].items() if len(records) > 0]
+
+        return changes
+
+    def __applyPlanetRecords(self, oldRecords, newRecords) -> Set[str]:
+        '''Removes, adds and updates planets that differ between two reads of a file'''
+        oldByName = {record[0]: self.__freeze(record) for record in oldRecords}
+        newByName = {record[0]: record for record in newRecords}
+        changes = set()
+
+        for name in oldByName.keys() - newByName.keys():
+            if not self.repository.planetExists(name):
+                continue
+
+            #A planet that moved to another file is left to the reload of that file
+            planet = self.repository.getPlanetByName(name)
+            if planet.containingFile != oldByName[name][3]:
+                continue
+
+            #Routes to a removed planet cannot be plotted or saved, so they go with it
+            for tradeRoute in self.repository.getTradeRoutesOfPlanets([planet]):
+                for campaign in self.repository.campaigns:
+                    campaign.tradeRoutes.discard(tradeRoute)
+                self.repository.removeTradeRoute(tradeRoute)
+                changes.add("tradeRoutes")
+
+            for campaign in self.repository.campaigns:
+                campaign.planets.discard(planet)
+            self.repository.removePlanet(planet)
+            changes.add("planets")
+
+        for name, record in newByName.items():
+            if not self.repository.planetExists(name):
+                self.addPlanetsFromRecords([record])
+                changes.add("planets")
+            elif name not in oldByName or self.__freeze(record) != oldByName[name]:
+                #Also covers planets the editor created itself, e.g. saved planet variants
+                changes |= self.__updatePlanet(self.repository.getPlanetByName(name), record)
+
+        if len(changes) > 0:
+            self.runPlanetVariantOfCheck()
+
+        return changes
+
+    def __updatePlanet(self, planet: Planet, record) -> Set[str]:
+        '''Updates an existing planet from its record and returns which kinds of changes that made'''
+        _, coordinates, variantOf, containingFile = record
+        changes = {"coordinates"}
+
+        if planet.variantOf != variantOf or planet.containingFile != containingFile:
+            planet.variantOf = self.__intern(variantOf)
+            planet.containingFile = self.__intern(containingFile)
+            changes.add("planets")
+
+        if coordinates is None:
+            planet.x, planet.y = None, None
+        else:
+            planet.x, planet.y, planet.z = coordinates
+
+        return changes
+
+    def __applyTradeRouteRecords(self, oldRecords, newRecords) -> Set[str]:
+        '''Removes, adds and reconnects trade routes that differ between two reads of a file'''
+        oldByName = {record[0]: self.__freeze(record) for record in oldRecords}
+        newByName = {record[0]: record for record in newRecords}
+        changes = set()
+
+        for name in oldByName.keys() - newByName.keys():
+            tradeRoute = self.repository.findTradeRouteIgnoreCase(name)
+            if tradeRoute is not None:
+                for campaign in self.repository.campaigns:
+                    campaign.tradeRoutes.discard(tradeRoute)
+                self.repository.removeTradeRoute(tradeRoute)
+                changes.add("tradeRoutes")
+
+        for name, record in newByName.items():
+            tradeRoute = self.repository.findTradeRouteIgnoreCase(name)
+            if tradeRoute is None:
+                self.addTradeRoutesFromRecords([record])
+                changes.add("tradeRoutes")
+            elif name not in oldByName or self.__freeze(record) != oldByName[name]:
+                #A route that is new to the file may already exist, e.g. one created in the editor and saved.
+                #The same object is reconnected, so campaigns keep referring to it
+                _, pointA, pointB = record
+                start = self.__xml.getPlanet(pointA, self.repository)
+                end = self.__xml.getPlanet(pointB, self.repository)
+                if tradeRoute.start is start and tradeRoute.end is end:
+                    continue
+
+                self.repository.removeTradeRoute(tradeRoute)
+                changes.add("tradeRoutes")
+
+                if start is None or end is None:
+                    for campaign in self.repository.campaigns:
+                        campaign.tradeRoutes.discard(tradeRoute)
+                    continue
+
+                tradeRoute.start = start
+                tradeRoute.end = end
+                self.repository.addTradeRoute(tradeRoute)
+
+        return changes
+
+    def __applyFactionRecords(self, oldNames, newNames) -> Set[str]:
+        '''Removes and adds factions that differ between two reads of a file'''
+        removedNames = set(oldNames) - set(newNames)
+        addedNames = [name for name in newNames if name not in oldNames]
+
+        for faction in self.repository.factions:
+            if faction.name in removedNames:
+                self.repository.removeFaction(faction)
+
+        self.addFactionsFromRecords(addedNames)
+
+        if len(removedNames) > 0 or len(addedNames) > 0:
+            return {"factions"}
+        return set()
+
+    def __applyCampaignRecords(self, oldRecords, newRecords) -> Set[str]:
+        '''Removes, adds and updates campaigns that differ between two reads of a file'''
+        oldByName = {record[0]: self.__freeze(record) for record in oldRecords}
+        newByName = {record[0]: record for record in newRecords}
+        changes = set()
+
+        for name in oldByName.keys() - newByName.keys():
+            campaign = self.repository.getCampaignByName(name)
+            if campaign is not None:
+                self.repository.removeCampaign(campaign)
+                changes.add("campaigns")
+
+        for name, record in newByName.items():
+            campaign = self.repository.getCampaignByName(name)
+            if name not in oldByName or campaign is None:
+                self.addCampaignsFromRecords([record])
+                changes.add("campaigns")
+            elif self.__freeze(record) != oldByName[name]:
+                _, setName, campaignPlanetNames, campaignTradeRouteNames = record
+                self.__fillCampaign(campaign, setName, campaignPlanetNames, campaignTradeRouteNames)
+                changes.add("campaigns")
+
+        return changes
+
+    def __freeze(self, record):
+        '''Turns the lists in a record into tuples, so records read from the load cache compare equal to parsed ones'''
+        if isinstance(record, (list, tuple)):
+            return tuple(self.__freeze(value) for value in record)
+        return record
+
+    def __pathKey(self, path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def __reportProgress(self, phase: str, done: int, total: int, text: str) -> None:
+        '''Passes progress on to the load's progress callback and stops the load if it was cancelled'''
+        if self.__isCancelled is not None and self.__isCancelled():
+            raise LoadCancelled()
+
+        if self.__progress is not None:
+            self.__progress(done, total, phase + ": " + text if text else phase)
+
+    def __extractPlanetRecords(self, file: str, XMLRoot) -> list:
+        '''Returns the planet records of a GameObject file, or an empty list if it has no planets'''
+        if not self.__xml.hasTag(XMLRoot, "Planet"):
+            return []
+
+        return self.__xml.getPlanetRecordsFromXML(file, XMLRoot)
+
+    def __extractTradeRouteRecords(self, file: str, XMLRoot) -> list:
+        return self.__xml.getTradeRouteRecordsFromXML(XMLRoot)
+
+    def __extractFactionRecords(self, file: str, XMLRoot) -> list:
+        return self.__xml.getNamesFromXML(XMLRoot)
+
+    def __extractCampaignRecords(self, file: str, XMLRoot) -> list:
+        return self.__xml.getCampaignRecordsFromXML(XMLRoot)
+
+    def __intern(self, value: str) -> str:
+        '''Interns names read from XML, so objects and campaigns referring to the same name share one string'''
+        if isinstance(value, str):
+            return sys.intern(value)
+        return value
+
+    def __xmlPath(self, file: str) -> str:
+        '''Returns the path of a file referenced in a metafile'''
+        return self.__folder + "/XML/" + file
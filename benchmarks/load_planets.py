@@ -0,0 +1,25 @@
+'''Times loading synthetic mods of growing planet counts. With single-pass planet extraction the
+time per planet should stay roughly constant, i.e. the load time grows linearly with the planet count'''
+import argparse
+import tempfile
+
+import syntheticmod
+from RepositoryCreator import RepositoryCreator
+
+
+def main() -> None:
+    argumentParser = argparse.ArgumentParser(description = __doc__)
+    argumentParser.add_argument("--planets", type = int, nargs = "+", default = [500, 1000, 2000, 4000, 8000])
+    argumentParser.add_argument("--repeats", type = int, default = 3)
+    arguments = argumentParser.parse_args()
+
+    print("planets  routes  load seconds  microseconds per planet")
+    for planets in arguments.planets:
+        with tempfile.TemporaryDirectory() as folder:
+            syntheticmod.createMod(folder, planets, tradeRoutes = 2 * planets)
+            seconds = syntheticmod.timed(lambda: RepositoryCreator(1, useCache = False).constructRepository(folder), repeats = arguments.repeats)
+            print("%7d  %6d  %12.3f  %23.1f" % (planets, 2 * planets, seconds, seconds / planets * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+'''Reports the memory per game object at 100k objects with tracemalloc, for the __slots__ classes and for
+copies of them that keep their attributes in a per-instance __dict__ as before. Also shows what interning
+the containing file name saves when every planet read its own copy of it from XML'''
+import argparse
+import gc
+import sys
+import tracemalloc
+
+import syntheticmod  #Makes the editor's modules importable
+from gameObjects.aiplayer import AIPlayer
+from gameObjects.campaign import Campaign
+from gameObjects.faction import Faction
+from gameObjects.planet import Planet
+from gameObjects.traderoute import TradeRoute
+from gameObjects.unit import Unit
+
+
+def withoutSlots(cls: type) -> type:
+    '''Returns a copy of a game object class that stores its attributes in a __dict__.
+    The mangled attribute names stay the same, so the copy runs the class' own code'''
+    namespace = {name: value for name, value in vars(cls).items() if name not in ("__dict__", "__weakref__", "__slots__")}
+    for slot in cls.__slots__:
+        namespace.pop("_" + cls.__name__ + slot, None)
+
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+def makePlanet(cls: type, index: int, containingFile: str):
+    planet = cls("Planet_" + str(index))
+    planet.containingFile = containingFile
+    planet.x = float(index)
+    planet.y = float(index)
+    return planet
+
+
+def makeTradeRoute(cls: type, index: int, planet):
+    tradeRoute = cls("Trade_Route_" + str(index))
+    tradeRoute.start = planet
+    tradeRoute.end = planet
+    return tradeRoute
+
+
+def bytesPerObject(create, count: int) -> float:
+    '''Returns the traced memory per object of count objects made by create(index), including their names'''
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [create(index) for index in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    #The list holding the objects is not part of their size
+    return (after - before - sys.getsizeof(objects)) / count
+
+
+def main() -> None:
+    argumentParser = argparse.ArgumentParser(description = __doc__)
+    argumentParser.add_argument("--objects", type = int, default = 100000)
+    arguments = argumentParser.parse_args()
+    count = arguments.objects
+
+    planet = Planet("Planet")
+    factories = {
+        Planet: lambda cls: lambda index: makePlanet(cls, index, "Planets.xml"),
+        TradeRoute: lambda cls: lambda index: makeTradeRoute(cls, index, planet),
+        Campaign: lambda cls: lambda index: cls("Campaign_" + str(index)),
+        Faction: lambda cls: lambda index: cls("Faction_" + str(index)),
+        AIPlayer: lambda cls: lambda index: cls("AIPlayer_" + str(index)),
+        Unit: lambda cls: lambda index: cls("Unit_" + str(index))
+    }
+
+    print("%d objects each, bytes per object including its name" % count)
+    print("class        __dict__  __slots__  saved")
+    for cls, factory in factories.items():
+        dictBytes = bytesPerObject(factory(withoutSlots(cls)), count)
+        slotBytes = bytesPerObject(factory(cls), count)
+        print("%-10s  %9.1f  %9.1f  %4.0f %%" % (cls.__name__, dictBytes, slotBytes, 100.0 * (1.0 - slotBytes / dictBytes)))
+
+    #Strings parsed from XML are new objects, even if their text is the same
+    copiedFile = lambda index: makePlanet(Planet, index, "".join(["Planets", ".xml"]))
+    internedFile = lambda index: makePlanet(Planet, index, sys.intern("".join(["Planets", ".xml"])))
+    print()
+    print("Planet with its own containingFile copy:  %7.1f bytes" % bytesPerObject(copiedFile, count))
+    print("Planet with an interned containingFile:   %7.1f bytes" % bytesPerObject(internedFile, count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+'''Compares parsing and loading a synthetic mod with 1, 2, 4 and 8 parse workers,
+and checks that every worker count loads the same planets, trade routes and campaigns'''
+import argparse
+import os
+import tempfile
+
+import syntheticmod
+from RepositoryCreator import RepositoryCreator
+from xmlUtil.xmlreader import XMLReader
+
+
+def parseAll(reader: XMLReader, paths: list) -> None:
+    XMLReader.clearParseCache()
+    reader.parseFiles(paths)
+
+
+def load(folder: str, workers: int):
+    return RepositoryCreator(workers, useCache = False).constructRepository(folder)
+
+
+def summary(repository) -> tuple:
+    '''Everything a load produces that has to be the same for all worker counts'''
+    planets = sorted((p.name, p.x, p.y, p.variantOf, p.containingFile) for p in repository.planets)
+    tradeRoutes = sorted((t.name, t.start.name, t.end.name) for t in repository.tradeRoutes)
+    campaigns = sorted((c.name, sorted(p.name for p in c.planets), sorted(t.name for t in c.tradeRoutes)) for c in repository.campaigns)
+    return planets, tradeRoutes, campaigns
+
+
+def main() -> None:
+    argumentParser = argparse.ArgumentParser(description = __doc__)
+    argumentParser.add_argument("--planets", type = int, default = 5000)
+    argumentParser.add_argument("--files", type = int, default = 400, help = "Number of GameObject files, a tenth of them with planets")
+    argumentParser.add_argument("--workers", type = int, nargs = "+", default = [1, 2, 4, 8])
+    argumentParser.add_argument("--repeats", type = int, default = 3)
+    arguments = argumentParser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        planetFiles = max(1, arguments.files // 10)
+        syntheticmod.createMod(folder, arguments.planets, tradeRoutes = 2 * arguments.planets,
+            planetFiles = planetFiles, otherFiles = arguments.files - planetFiles)
+        xmlFolder = os.path.join(folder, "XML")
+        paths = [os.path.join(xmlFolder, file) for file in sorted(os.listdir(xmlFolder))]
+
+        serial = None
+        print("workers  parse seconds  load seconds  same result as 1 worker")
+        for workers in arguments.workers:
+            parseSeconds = syntheticmod.timed(parseAll, XMLReader(workers), paths, repeats = arguments.repeats)
+            loadSeconds = syntheticmod.timed(load, folder, workers, repeats = arguments.repeats)
+
+            result = summary(syntheticmod.quietly(load, folder, workers))
+            if serial is None:
+                serial = result
+
+            print("%7d  %13.3f  %12.3f  %s" % (workers, parseSeconds, loadSeconds, result == serial))
+
+
+if __name__ == "__main__":
+    main()
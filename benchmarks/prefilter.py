@@ -0,0 +1,56 @@
+'''Measures what the <Planet> byte prefilter saves on a synthetic mod where most GameObject files
+have no planets: parsing every file versus scanning every file and parsing only those that may contain planets'''
+import argparse
+import os
+import tempfile
+
+import syntheticmod
+from xmlUtil.xmlreader import XMLReader
+
+
+def parseEveryFile(reader: XMLReader, paths: list) -> int:
+    XMLReader.clearParseCache()
+    for path in paths:
+        reader.parseFile(path)
+    return len(paths)
+
+
+def parseAfterPrefilter(reader: XMLReader, paths: list) -> int:
+    XMLReader.clearParseCache()
+    parsed = 0
+    for path in paths:
+        if reader.mayContainTag(path, "Planet"):
+            reader.parseFile(path)
+            parsed += 1
+    return parsed
+
+
+def main() -> None:
+    argumentParser = argparse.ArgumentParser(description = __doc__)
+    argumentParser.add_argument("--files", type = int, default = 500)
+    argumentParser.add_argument("--planet-share", type = float, default = 0.1, help = "Share of GameObject files that contain planets")
+    argumentParser.add_argument("--planets", type = int, default = 5000)
+    argumentParser.add_argument("--units-per-file", type = int, default = 200)
+    argumentParser.add_argument("--repeats", type = int, default = 3)
+    arguments = argumentParser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        planetFiles = max(1, int(arguments.files * arguments.planet_share))
+        syntheticmod.createMod(folder, arguments.planets, planetFiles = planetFiles, otherFiles = arguments.files - planetFiles,
+            unitsPerFile = arguments.units_per_file)
+
+        reader = XMLReader()
+        paths = [os.path.join(folder, "XML", file) for file in reader.findMetaFileList(os.path.join(folder, "XML", "GameObjectFiles.XML"))]
+
+        fullSeconds = syntheticmod.timed(parseEveryFile, reader, paths, repeats = arguments.repeats)
+        prefilterSeconds = syntheticmod.timed(parseAfterPrefilter, reader, paths, repeats = arguments.repeats)
+        parsed = parseAfterPrefilter(reader, paths)
+
+        print("GameObject files:          %d (%d with planets)" % (len(paths), planetFiles))
+        print("Parse every file:          %.3f s" % fullSeconds)
+        print("Prefilter, then parse:     %.3f s (%d files parsed)" % (prefilterSeconds, parsed))
+        print("Saved:                     %.0f %%" % (100.0 * (1.0 - prefilterSeconds / fullSeconds)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+'''Compares drawing trade routes as one Line2D per route, as the galactic plot used to, with drawing them
+as a single LineCollection with per-segment colours, at 1k, 10k and 50k segments'''
+import argparse
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+def makeSegments(count: int, seed: int = 1) -> np.ndarray:
+    randomNumbers = np.random.default_rng(seed)
+    return randomNumbers.uniform(-500.0, 500.0, (count, 2, 2))
+
+
+def makeAxes():
+    figure = Figure(figsize = (8, 8), dpi = 100)
+    canvas = FigureCanvasAgg(figure)
+    axes = figure.add_subplot(111)
+    axes.set_xlim(-500, 500)
+    axes.set_ylim(-500, 500)
+    return canvas, axes
+
+
+def buildLines(axes, segments: np.ndarray, colors: np.ndarray) -> None:
+    for segment, color in zip(segments, colors):
+        axes.plot(segment[:, 0], segment[:, 1], color = color, linewidth = 1)
+
+
+def buildCollection(axes, segments: np.ndarray, colors: np.ndarray) -> None:
+    axes.add_collection(LineCollection(segments, colors = colors, linewidths = 1))
+
+
+def measure(build, segments: np.ndarray, colors: np.ndarray, repeats: int) -> tuple:
+    '''Returns the seconds to create the artists and the fastest full redraw afterwards'''
+    canvas, axes = makeAxes()
+    start = time.perf_counter()
+    build(axes, segments, colors)
+    buildSeconds = time.perf_counter() - start
+
+    drawSeconds = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        canvas.draw()
+        elapsed = time.perf_counter() - start
+        drawSeconds = elapsed if drawSeconds is None else min(drawSeconds, elapsed)
+
+    return buildSeconds, drawSeconds
+
+
+def main() -> None:
+    argumentParser = argparse.ArgumentParser(description = __doc__)
+    argumentParser.add_argument("--segments", type = int, nargs = "+", default = [1000, 10000, 50000])
+    argumentParser.add_argument("--repeats", type = int, default = 3)
+    argumentParser.add_argument("--skip-lines-above", type = int, default = 50000, help = "Do not time one Line2D per route above this many segments")
+    arguments = argumentParser.parse_args()
+
+    print("segments  Line2D build  Line2D draw  LineCollection build  LineCollection draw")
+    for count in arguments.segments:
+        segments = makeSegments(count)
+        #Mostly plain routes with a few selected and new ones, as in a large campaign
+        colors = np.tile(np.array([[0.5, 0.5, 0.5, 1.0]]), (count, 1))
+        colors[::10] = (1.0, 0.0, 0.0, 1.0)
+        colors[::25] = (0.0, 0.8, 0.0, 1.0)
+
+        collectionBuild, collectionDraw = measure(buildCollection, segments, colors, arguments.repeats)
+        if count <= arguments.skip_lines_above:
+            linesBuild, linesDraw = measure(buildLines, segments, colors, arguments.repeats)
+            lines = "%12.3f  %11.3f" % (linesBuild, linesDraw)
+        else:
+            lines = "%12s  %11s" % ("skipped", "skipped")
+
+        print("%8d  %s  %20.3f  %19.3f" % (count, lines, collectionBuild, collectionDraw))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+'''Times "Select All Planets" and "Deselect All Planets" in the main window on a synthetic galaxy,
+from the button click until the galactic plot has been redrawn, and how many planets it drew as
+single markers. Runs without a display if QT_QPA_PLATFORM=offscreen is set'''
+import argparse
+import os
+import tempfile
+import time
+
+import syntheticmod
+from PyQt5.QtWidgets import QApplication, QPushButton
+
+from config import Config
+from RepositoryCreator import RepositoryCreator
+from ui.mainwindow_presenter import MainWindowPresenter
+from ui.qtmainwindow import QtMainWindow
+
+
+class BenchmarkMainWindow(QtMainWindow):
+    '''Main window that keeps the plot it creates, so the benchmark can wait for its redraws'''
+    def makeGalacticPlot(self):
+        self.plot = super().makeGalacticPlot()
+        return self.plot
+
+
+def clickAndWait(application: QApplication, window: BenchmarkMainWindow, button: QPushButton) -> tuple:
+    '''Returns the seconds until the click was handled and until the plot was redrawn after it'''
+    redraws = window.plot.redrawsPerformed
+    start = time.perf_counter()
+    button.click()
+    clickSeconds = time.perf_counter() - start
+
+    while window.plot.redrawsPerformed == redraws:
+        application.processEvents()
+        time.sleep(0.001)
+
+    return clickSeconds, time.perf_counter() - start
+
+
+def main() -> None:
+    argumentParser = argparse.ArgumentParser(description = __doc__)
+    argumentParser.add_argument("--planets", type = int, default = 5000)
+    argumentParser.add_argument("--routes", type = int, default = 10000)
+    argumentParser.add_argument("--repeats", type = int, default = 3)
+    argumentParser.add_argument("--lod-threshold", type = int, default = None, help = "Overrides LevelOfDetailThreshold of config.xml")
+    arguments = argumentParser.parse_args()
+
+    application = QApplication([])
+
+    with tempfile.TemporaryDirectory() as folder:
+        syntheticmod.createMod(folder, arguments.planets, tradeRoutes = arguments.routes)
+
+        #Config reads config.xml from the working directory, like testy.py
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        config = Config()
+        if arguments.lod_threshold is not None:
+            config.levelOfDetailThreshold = arguments.lod_threshold
+        repositoryCreator = RepositoryCreator(1, useCache = False)
+        repository = syntheticmod.quietly(repositoryCreator.constructRepository, folder)
+
+        window = BenchmarkMainWindow()
+        presenter = syntheticmod.quietly(MainWindowPresenter, window, repository, config, repositoryCreator)
+        window.setMainWindowPresenter(presenter)
+        window.getWindow().show()
+        application.processEvents()
+
+        buttons = {button.text(): button for button in window.getWindow().findChildren(QPushButton)}
+
+        print("%d planets, %d trade routes, level of detail above %d planets" % (arguments.planets, arguments.routes, config.levelOfDetailThreshold))
+        print("action                 handled s  redrawn s  markers")
+        for _ in range(arguments.repeats):
+            for action in ("Deselect All Planets", "Select All Planets"):
+                clickSeconds, totalSeconds = clickAndWait(application, window, buttons[action])
+                print("%-21s  %9.3f  %9.3f  %7d" % (action, clickSeconds, totalSeconds, window.plot.planetsDrawn))
+
+
+if __name__ == "__main__":
+    main()
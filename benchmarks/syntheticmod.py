@@ -0,0 +1,93 @@
+'''Builds synthetic mod Data folders for the benchmarks in this folder'''
+import contextlib
+import io
+import math
+import os
+import random
+import sys
+import time
+
+#The benchmarks import the editor's modules the same way testy.py does, from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def createMod(folder: str, planets: int, tradeRoutes: int = 0, planetFiles: int = 4, otherFiles: int = 0,
+        unitsPerFile: int = 50, seed: int = 1) -> str:
+    '''Writes a Data folder with the given number of planets spread over planetFiles files, trade routes
+    between random planets, otherFiles GameObject files without planets and one campaign using every planet.
+    Returns the folder'''
+    randomNumbers = random.Random(seed)
+    #The galaxy grows with the planet count, so planets keep about as many neighbours within the
+    #default fleet movement distance of 100 as in the vanilla galaxy
+    extent = 40.0 * math.sqrt(max(planets, 1))
+    xmlFolder = os.path.join(folder, "XML")
+    os.makedirs(xmlFolder, exist_ok = True)
+
+    planetNames = ["Planet_" + str(i) for i in range(planets)]
+    gameObjectFiles = []
+
+    for fileIndex in range(planetFiles):
+        fileName = "Planets_" + str(fileIndex) + ".xml"
+        gameObjectFiles.append(fileName)
+        entries = []
+        for name in planetNames[fileIndex::planetFiles]:
+            x = round(randomNumbers.uniform(-extent, extent), 1)
+            y = round(randomNumbers.uniform(-extent, extent), 1)
+            entries.append('\t<Planet Name="' + name + '">\n\t\t<Galactic_Position>' + str(x) + ", " + str(y) + ", 10.0</Galactic_Position>\n\t</Planet>\n")
+        writeFile(xmlFolder, fileName, "<Planets>\n" + "".join(entries) + "</Planets>\n")
+
+    for fileIndex in range(otherFiles):
+        fileName = "Units_" + str(fileIndex) + ".xml"
+        gameObjectFiles.append(fileName)
+        entries = []
+        for unitIndex in range(unitsPerFile):
+            entries.append('\t<SpaceUnit Name="Unit_' + str(fileIndex) + "_" + str(unitIndex) + '">\n\t\t<Max_Speed>2.0</Max_Speed>\n'
+                + "\t\t<Planet_Surface_Accessible>No</Planet_Surface_Accessible>\n\t\t<Tactical_Health>1000</Tactical_Health>\n\t</SpaceUnit>\n")
+        writeFile(xmlFolder, fileName, "<SpaceUnits>\n" + "".join(entries) + "</SpaceUnits>\n")
+
+    routeNames = []
+    entries = []
+    for routeIndex in range(tradeRoutes if planets > 1 else 0):
+        start, end = randomNumbers.sample(planetNames, 2)
+        routeNames.append("Trade_Route_" + str(routeIndex))
+        entries.append('\t<TradeRoute Name="' + routeNames[-1] + '">\n\t\t<Point_A>' + start + "</Point_A>\n\t\t<Point_B>" + end + "</Point_B>\n\t</TradeRoute>\n")
+    writeFile(xmlFolder, "TradeRoutes.xml", "<TradeRoutes>\n" + "".join(entries) + "</TradeRoutes>\n")
+
+    writeFile(xmlFolder, "Factions.xml", '<Factions>\n\t<Faction Name="Empire"/>\n\t<Faction Name="Rebel"/>\n</Factions>\n')
+    writeFile(xmlFolder, "Campaigns.xml", '<Campaigns>\n\t<Campaign Name="Synthetic">\n\t\t<Campaign_Set>Synthetic</Campaign_Set>\n'
+        + "\t\t<Locations>" + ", ".join(planetNames) + "</Locations>\n"
+        + "\t\t<Trade_Routes>" + ", ".join(routeNames) + "</Trade_Routes>\n\t</Campaign>\n</Campaigns>\n")
+
+    writeMetaFile(xmlFolder, "GameObjectFiles.XML", gameObjectFiles)
+    writeMetaFile(xmlFolder, "TradeRouteFiles.XML", ["TradeRoutes.xml"])
+    writeMetaFile(xmlFolder, "FactionFiles.XML", ["Factions.xml"])
+    writeMetaFile(xmlFolder, "CampaignFiles.XML", ["Campaigns.xml"])
+
+    return folder
+
+
+def quietly(function, *arguments):
+    '''Calls function without showing what it prints'''
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*arguments)
+
+
+def timed(function, *arguments, repeats: int = 3) -> float:
+    '''Returns the fastest of several runs of function in seconds, hiding what it prints'''
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        quietly(function, *arguments)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def writeFile(xmlFolder: str, fileName: str, content: str) -> None:
+    with open(os.path.join(xmlFolder, fileName), "w", encoding = "utf-8") as file:
+        file.write('<?xml version="1.0" encoding="utf-8"?>\n' + content)
+
+
+def writeMetaFile(xmlFolder: str, fileName: str, files: list) -> None:
+    writeFile(xmlFolder, fileName, "<Files>\n" + "".join("\t<File>" + file + "</File>\n" for file in files) + "</Files>\n")
@@ -9,7 +9,19 @@ class Config():
 
         self.dataPath = self.__configRoot.find("DataPath").text
         self.autoPlanetConnectionDistance = int(self.__configRoot.find("MaximumFleetMovementDistance").text)
+        self.loadingThreads = self.__getInt("LoadingThreads", 1)
+        self.useLoadCache = self.__getInt("UseLoadCache", 1) != 0
+        self.frameBudget = self.__getInt("FrameBudget", 16)
+        self.levelOfDetailThreshold = self.__getInt("LevelOfDetailThreshold", 5000)
+        self.watchFiles = self.__getInt("WatchFiles", 0) != 0
 
         if not self.dataPath:
             self.dataPath = os.getcwd()
-                
\ No newline at end of file
+
+    def __getInt(self, tag: str, default: int) -> int:
+        '''Reads an optional integer setting, falling back to default if it is missing'''
+        element = self.__configRoot.find(tag)
+        if element is None or not element.text:
+            return default
+
+        return int(element.text)
@@ -6,6 +6,8 @@ from gameObjects.traderoute import TradeRoute
 '''Campaign class definition'''
 class Campaign:
     '''Campaigns have a name, set name, planets and traderoutes'''
+    __slots__ = ("__name", "__setName", "__planets", "__tradeRoutes")
+
     def __init__(self, name: str):
         self.__name: str = name
         self.__setName: str = "Empty"
@@ -0,0 +1,79 @@
+from typing import List
+
+import numpy as np
+
+
+class CoordinateStore:
+    '''Galactic positions of many planets in one contiguous (n, 3) array of x, y and z.
+        Every planet owns a slot, its row in the array. Missing coordinates are stored as NaN'''
+    def __init__(self, capacity: int = 1024):
+        self.__positions: np.ndarray = np.full((max(capacity, 1), 3), np.nan)
+        self.__count: int = 0
+        self.__freeSlots: List[int] = []
+        #Incremented whenever all slots are released, so slots cached elsewhere can be recognised as stale
+        self.__generation: int = 0
+
+    def allocate(self, x: float = None, y: float = None, z: float = None) -> int:
+        '''Reserves a slot, stores the given coordinates in it and returns it'''
+        if len(self.__freeSlots) > 0:
+            slot = self.__freeSlots.pop()
+        else:
+            if self.__count == len(self.__positions):
+                self.__grow()
+            slot = self.__count
+            self.__count += 1
+
+        self.__positions[slot] = (self.__toFloat(x), self.__toFloat(y), self.__toFloat(z))
+        return slot
+
+    def free(self, slot: int) -> None:
+        '''Releases a slot, it may be handed out again by allocate'''
+        self.__positions[slot] = np.nan
+        self.__freeSlots.append(slot)
+
+    def clear(self) -> None:
+        '''Releases all slots'''
+        self.__positions[:self.__count] = np.nan
+        self.__count = 0
+        self.__freeSlots.clear()
+        self.__generation += 1
+
+    def get(self, slot: int, axis: int) -> float:
+        '''Returns one coordinate of a slot, or None if it is missing'''
+        value = self.__positions[slot, axis]
+        if np.isnan(value):
+            return None
+        return float(value)
+
+    def set(self, slot: int, axis: int, value: float) -> None:
+        '''Sets one coordinate of a slot. None marks it as missing'''
+        self.__positions[slot, axis] = self.__toFloat(value)
+
+    def setMany(self, slots: np.ndarray, x: float, y: float) -> None:
+        '''Moves the planets in several slots to the same x and y'''
+        self.__positions[slots, 0] = self.__toFloat(x)
+        self.__positions[slots, 1] = self.__toFloat(y)
+
+    def xy(self, slots: np.ndarray) -> np.ndarray:
+        '''Returns an (n, 2) array of the x and y coordinates of the given slots'''
+        return self.__positions[slots, :2]
+
+    @property
+    def positions(self) -> np.ndarray:
+        '''View of the (n, 3) coordinates of all slots handed out so far, free slots are NaN'''
+        return self.__positions[:self.__count]
+
+    @property
+    def generation(self) -> int:
+        return self.__generation
+
+    def __grow(self) -> None:
+        '''Doubles the capacity. Views returned before point to the old array afterwards'''
+        positions = np.full((2 * len(self.__positions), 3), np.nan)
+        positions[:self.__count] = self.__positions[:self.__count]
+        self.__positions = positions
+
+    def __toFloat(self, value: float) -> float:
+        if value is None:
+            return np.nan
+        return value
@@ -4,6 +4,8 @@ from gameObjects.aiplayer import AIPlayer
 
 class Faction:
     '''Factions have a name, capital planet, and AI'''
+    __slots__ = ("__name", "__capital", "__aiplayer")
+
     def __init__(self, name: str):
         self.__name: str = name
         self.__capital: Planet = None
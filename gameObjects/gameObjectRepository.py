@@ -1,5 +1,8 @@
-from typing import List, Set
+from typing import Dict, List, Set, Tuple
 
+import numpy as np
+
+from gameObjects.coordinatestore import CoordinateStore
 from gameObjects.planet import Planet
 from gameObjects.traderoute import TradeRoute
 from gameObjects.campaign import Campaign
@@ -17,53 +20,109 @@ class GameObjectRepository:
         self.__aiplayers: Set[AIPlayer] = set()
         self.__units: Set[Unit] = set()
 
+        #Lookup indexes, kept in step with the sets above by the add/remove/empty methods
+        self.__campaignsByName: Dict[str, Campaign] = dict()
+        self.__planetsByName: Dict[str, Planet] = dict()
+        self.__planetsByLowerName: Dict[str, Planet] = dict()
+        self.__tradeRoutesByName: Dict[str, TradeRoute] = dict()
+        self.__tradeRoutesByLowerName: Dict[str, TradeRoute] = dict()
+        self.__tradeRoutesByPlanets: Dict[Tuple[Planet, Planet], TradeRoute] = dict()
+        self.__tradeRoutesByPlanet: Dict[Planet, Set[TradeRoute]] = dict()
+
+        #Coordinates of all planets in the repository, one slot each
+        self.__coordinates: CoordinateStore = CoordinateStore()
+
     def addCampaign(self, campaign: Campaign) -> None:
         '''Add a Campaign to the repository'''
         self.__campaigns.add(campaign)
+        self.__campaignsByName[campaign.name] = campaign
 
     def removeCampaign(self, campaign: Campaign) -> None:
         '''Remove a Campaign from the repository'''
         self.__campaigns.remove(campaign)
+        self.__removeFromIndex(self.__campaignsByName, campaign.name, campaign)
 
     def addPlanet(self, planet: Planet) -> None:
         '''Add a Planet to the repository'''
+        if planet.coordinateStore is not self.__coordinates:
+            planet.attachCoordinates(self.__coordinates, self.__coordinates.allocate())
         self.__planets.add(planet)
+        self.__planetsByName[planet.name] = planet
+        self.__planetsByLowerName[planet.name.lower()] = planet
 
     def removePlanet(self, planet: Planet) -> None:
         '''Remove a Planet from the repository'''
         self.__planets.remove(planet)
+        self.__removeFromIndex(self.__planetsByName, planet.name, planet)
+        self.__removeFromIndex(self.__planetsByLowerName, planet.name.lower(), planet)
 
-    def planetExists(self, name: str) -> None:
-        '''Returns true if a planet exists by name, false otherwise'''
-        try:
-            self.getPlanetByName(name)
-            return True
-        except:
-            return False
+        slot = planet.coordinateSlot
+        planet.detachCoordinates()
+        self.__coordinates.free(slot)
+
+    def getPlanetSlots(self, planets: List[Planet]) -> np.ndarray:
+        '''Returns the coordinate slots of planets, as indexes into coordinates.positions'''
+        return np.fromiter((p.coordinateSlot for p in planets), dtype = np.intp, count = len(planets))
+
+    def setPlanetPositions(self, planets: List[Planet], x: float, y: float) -> None:
+        '''Moves several planets to the same x and y at once'''
+        self.__coordinates.setMany(self.getPlanetSlots(planets), x, y)
 
-    def tradeRouteExists(self, startName: str, endName: str) -> None:
+    def planetExists(self, name: str) -> bool:
         '''Returns true if a planet exists by name, false otherwise'''
-        try:
-            self.getTradeRouteByPlanets(self.getPlanetByName(startName), self.getPlanetByName(endName))
-            return True
-        except:
-            return False
+        return name in self.__planetsByName
 
-    def getPlanetByName(self, name: str) -> None:
+    def tradeRouteExists(self, startName: str, endName: str) -> bool:
+        '''Returns true if a trade route exists between two planets given by name, false otherwise'''
+        start = self.__planetsByName.get(startName)
+        end = self.__planetsByName.get(endName)
+        return (start, end) in self.__tradeRoutesByPlanets
+
+    def getPlanetByName(self, name: str) -> Planet:
         '''Returns a planet object given its name'''
-        for planet in self.planets:
-            if planet.name == name:
-                return planet
+        planet = self.__planetsByName.get(name)
+        if planet is None:
+            raise RuntimeError("Searching for non existing planet " + name)
+
+        return planet
 
-        raise RuntimeError("Searching for non existing planet " + name)
+    def findPlanetIgnoreCase(self, name: str) -> Planet:
+        '''Returns a planet object given its name in any case, or None if it does not exist'''
+        return self.__planetsByLowerName.get(name.lower())
 
-    def getTradeRouteByPlanets(self, start: Planet, end: Planet) -> None:
+    def getTradeRouteByPlanets(self, start: Planet, end: Planet) -> TradeRoute:
         '''Returns a traderoute object given its start and end planets'''
-        for tradeRoute in self.tradeRoutes:
-            if (tradeRoute.start == start) and (tradeRoute.end == end):
-                return tradeRoute
+        tradeRoute = self.__tradeRoutesByPlanets.get((start, end))
+        if tradeRoute is None:
+            raise RuntimeError("Searching for non existing Trade Route")
+
+        return tradeRoute
+
+    def getTradeRouteByName(self, name: str) -> TradeRoute:
+        '''Returns a traderoute object given its name'''
+        tradeRoute = self.__tradeRoutesByName.get(name)
+        if tradeRoute is None:
+            raise RuntimeError("Searching for non existing Trade Route " + name)
+
+        return tradeRoute
+
+    def findTradeRouteIgnoreCase(self, name: str) -> TradeRoute:
+        '''Returns a traderoute object given its name in any case, or None if it does not exist'''
+        return self.__tradeRoutesByLowerName.get(name.lower())
 
-        raise RuntimeError("Searching for non existing Trade Route")
+    def getTradeRoutesOfPlanets(self, planets) -> Set[TradeRoute]:
+        '''Returns all trade routes that start or end at one of the given planets'''
+        tradeRoutes = set()
+        for planet in planets:
+            incidentRoutes = self.__tradeRoutesByPlanet.get(planet)
+            if incidentRoutes is not None:
+                tradeRoutes.update(incidentRoutes)
+
+        return tradeRoutes
+
+    def getCampaignByName(self, name: str) -> Campaign:
+        '''Returns a campaign object given its name, or None if it does not exist'''
+        return self.__campaignsByName.get(name)
 
     def getPlanetNames(self) -> List[str]:
         '''Returns a list containing all Planet names'''
@@ -72,10 +131,25 @@ class GameObjectRepository:
     def addTradeRoute(self, tradeRoute: TradeRoute) -> None:
         '''Add a TradeRoute to the repository'''
         self.__tradeRoutes.add(tradeRoute)
+        self.__tradeRoutesByName[tradeRoute.name] = tradeRoute
+        self.__tradeRoutesByLowerName[tradeRoute.name.lower()] = tradeRoute
+        self.__tradeRoutesByPlanets[(tradeRoute.start, tradeRoute.end)] = tradeRoute
+        self.__tradeRoutesByPlanet.setdefault(tradeRoute.start, set()).add(tradeRoute)
+        self.__tradeRoutesByPlanet.setdefault(tradeRoute.end, set()).add(tradeRoute)
 
     def removeTradeRoute(self, tradeRoute: TradeRoute) -> None:
         '''Remove a TradeRoute from the repository'''
         self.__tradeRoutes.remove(tradeRoute)
+        self.__removeFromIndex(self.__tradeRoutesByName, tradeRoute.name, tradeRoute)
+        self.__removeFromIndex(self.__tradeRoutesByLowerName, tradeRoute.name.lower(), tradeRoute)
+        self.__removeFromIndex(self.__tradeRoutesByPlanets, (tradeRoute.start, tradeRoute.end), tradeRoute)
+
+        for planet in (tradeRoute.start, tradeRoute.end):
+            incidentRoutes = self.__tradeRoutesByPlanet.get(planet)
+            if incidentRoutes is not None:
+                incidentRoutes.discard(tradeRoute)
+                if len(incidentRoutes) == 0:
+                    del self.__tradeRoutesByPlanet[planet]
 
     def addFaction(self, faction: Faction) -> None:
         '''Add a Faction to the repository'''
@@ -103,6 +177,11 @@ class GameObjectRepository:
 
     def emptyRepository(self) -> None:
         '''Empty the repository'''
+        #Planets still referenced elsewhere keep their coordinates
+        for planet in self.__planets:
+            planet.detachCoordinates()
+        self.__coordinates.clear()
+
         self.__campaigns.clear()
         self.__tradeRoutes.clear()
         self.__planets.clear()
@@ -110,6 +189,47 @@ class GameObjectRepository:
         self.__aiplayers.clear()
         self.__units.clear()
 
+        self.__campaignsByName.clear()
+        self.__planetsByName.clear()
+        self.__planetsByLowerName.clear()
+        self.__tradeRoutesByName.clear()
+        self.__tradeRoutesByLowerName.clear()
+        self.__tradeRoutesByPlanets.clear()
+        self.__tradeRoutesByPlanet.clear()
+
+    def takeContentsOf(self, other: "GameObjectRepository") -> None:
+        '''Replaces the contents of this repository with those of another one in a single step,
+        leaving the other repository empty. Lets a repository built elsewhere be swapped in
+        without replacing the object everyone holds a reference to'''
+        self.emptyRepository()
+
+        self.__campaigns, other.__campaigns = other.__campaigns, self.__campaigns
+        self.__planets, other.__planets = other.__planets, self.__planets
+        self.__tradeRoutes, other.__tradeRoutes = other.__tradeRoutes, self.__tradeRoutes
+        self.__factions, other.__factions = other.__factions, self.__factions
+        self.__aiplayers, other.__aiplayers = other.__aiplayers, self.__aiplayers
+        self.__units, other.__units = other.__units, self.__units
+
+        self.__campaignsByName, other.__campaignsByName = other.__campaignsByName, self.__campaignsByName
+        self.__planetsByName, other.__planetsByName = other.__planetsByName, self.__planetsByName
+        self.__planetsByLowerName, other.__planetsByLowerName = other.__planetsByLowerName, self.__planetsByLowerName
+        self.__tradeRoutesByName, other.__tradeRoutesByName = other.__tradeRoutesByName, self.__tradeRoutesByName
+        self.__tradeRoutesByLowerName, other.__tradeRoutesByLowerName = other.__tradeRoutesByLowerName, self.__tradeRoutesByLowerName
+        self.__tradeRoutesByPlanets, other.__tradeRoutesByPlanets = other.__tradeRoutesByPlanets, self.__tradeRoutesByPlanets
+        self.__tradeRoutesByPlanet, other.__tradeRoutesByPlanet = other.__tradeRoutesByPlanet, self.__tradeRoutesByPlanet
+
+        #The planets stay attached to their store, so it moves along with them
+        self.__coordinates, other.__coordinates = other.__coordinates, self.__coordinates
+
+    def __removeFromIndex(self, index: dict, key, gameObject) -> None:
+        '''Removes a key from an index, unless it has since been taken over by another object'''
+        if index.get(key) is gameObject:
+            del index[key]
+
+    @property
+    def coordinates(self) -> CoordinateStore:
+        return self.__coordinates
+
     @property
     def campaigns(self) -> Set[Campaign]:
         return set(self.__campaigns)
@@ -1,16 +1,24 @@
 from math import sqrt
+
+from gameObjects.coordinatestore import CoordinateStore
 '''Planet class definition'''
 
 
 class Planet:
-    '''Planets have a name and location (x, y), and starting forces'''
+    '''Planets have a name and location (x, y, z), and starting forces.
+    Once added to a repository, the location lives in the repository's CoordinateStore'''
+    __slots__ = ("__name", "__containingFile", "__variantOf", "__x", "__y", "__z", "__forces", "__store", "__slot")
+
     def __init__(self, name: str):
         self.__name: str = name
         self.__containingFile = ""
         self.__variantOf: str = ""
         self.__x: float = 0.0
         self.__y: float = 0.0
+        self.__z: float = None
         self.__forces: list = []
+        self.__store: CoordinateStore = None
+        self.__slot: int = None
     
     def distanceTo(self, target):
         return sqrt((self.x - target.x)**2 + (self.y - target.y)**2)
@@ -44,19 +52,64 @@ class Planet:
 
     @property
     def x(self) -> float:
+        if self.__store is not None:
+            return self.__store.get(self.__slot, 0)
         return self.__x
 
     @x.setter
     def x(self, value: float) -> None:
-        self.__x = value
+        if self.__store is not None:
+            self.__store.set(self.__slot, 0, value)
+        else:
+            self.__x = value
 
     @property
     def y(self) -> float:
+        if self.__store is not None:
+            return self.__store.get(self.__slot, 1)
         return self.__y
 
     @y.setter
     def y(self, value: float) -> None:
-        self.__y = value
+        if self.__store is not None:
+            self.__store.set(self.__slot, 1, value)
+        else:
+            self.__y = value
+
+    @property
+    def z(self) -> float:
+        if self.__store is not None:
+            return self.__store.get(self.__slot, 2)
+        return self.__z
+
+    @z.setter
+    def z(self, value: float) -> None:
+        if self.__store is not None:
+            self.__store.set(self.__slot, 2, value)
+        else:
+            self.__z = value
+
+    @property
+    def coordinateStore(self) -> CoordinateStore:
+        return self.__store
+
+    @property
+    def coordinateSlot(self) -> int:
+        return self.__slot
+
+    def attachCoordinates(self, store: CoordinateStore, slot: int) -> None:
+        '''Moves the location into a slot of a CoordinateStore'''
+        x, y, z = self.x, self.y, self.z
+        self.__store = store
+        self.__slot = slot
+        self.x, self.y, self.z = x, y, z
+
+    def detachCoordinates(self) -> None:
+        '''Takes the location back out of its CoordinateStore'''
+        x, y, z = self.x, self.y, self.z
+        self.__store = None
+        self.__slot = None
+        self.x, self.y, self.z = x, y, z
 
     @property
     def forces(self) -> list:
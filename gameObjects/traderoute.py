@@ -4,6 +4,8 @@ from gameObjects.planet import Planet
 
 class TradeRoute:
     '''Trade routes have a name and a start/end planet'''
+    __slots__ = ("__name", "__start", "__end")
+
     def __init__(self, name: str):
         self.__name: str = name
         self.__start: Planet = None
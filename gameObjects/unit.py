@@ -3,6 +3,8 @@
 
 class Unit:
     '''Units have a name'''
+    __slots__ = ("__name",)
+
     def __init__(self, name: str):
         self.__name: str = name
 
@@ -0,0 +1,7 @@
+import os
+import sys
+
+#The editor runs from the repository root, make its modules importable the same way
+repositoryRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repositoryRoot not in sys.path:
+    sys.path.insert(0, repositoryRoot)
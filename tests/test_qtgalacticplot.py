@@ -0,0 +1,75 @@
+import os
+import time
+
+import pytest
+
+#The plot is tested without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+pytest.importorskip("matplotlib")
+
+from gameObjects.planet import Planet
+from ui.qtgalacticplot import QtGalacticPlot
+
+
+@pytest.fixture(scope = "module")
+def application():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def plot(application):
+    galacticPlot = QtGalacticPlot()
+    galacticPlot.getWidget().resize(800, 800)
+    galacticPlot.getWidget().show()
+    return galacticPlot
+
+
+def makeGrid(count: int) -> list:
+    planets = []
+    for i in range(count):
+        planet = Planet("Planet" + str(i))
+        planet.x = float(i % 50) * 10
+        planet.y = float(i // 50) * 10
+        planets.append(planet)
+    return planets
+
+
+def render(application, plot: QtGalacticPlot, selectedPlanets, planets) -> None:
+    redraws = plot.redrawsPerformed
+    plot.plotGalaxy(selectedPlanets, [], planets, 0)
+
+    deadline = time.perf_counter() + 5
+    while plot.redrawsPerformed == redraws and time.perf_counter() < deadline:
+        application.processEvents()
+        time.sleep(0.001)
+
+
+def test_levelOfDetail_drawsSelectedPlanetsUpToTheThreshold(application, plot):
+    planets = makeGrid(1000)
+    plot.setLevelOfDetailThreshold(200)
+
+    render(application, plot, planets[:100], planets)
+
+    assert plot.levelOfDetailActive
+    assert plot.planetsDrawn == 100
+
+
+def test_levelOfDetail_aggregatesSelectedPlanetsAboveTheThreshold(application, plot):
+    planets = makeGrid(1000)
+    plot.setLevelOfDetailThreshold(200)
+
+    render(application, plot, planets, planets)
+
+    assert plot.levelOfDetailActive
+    assert plot.planetsDrawn == 0
+
+
+def test_levelOfDetail_offDrawsEveryPlanet(application, plot):
+    planets = makeGrid(1000)
+    plot.setLevelOfDetailThreshold(0)
+
+    render(application, plot, planets, planets)
+
+    assert not plot.levelOfDetailActive
+    assert plot.planetsDrawn == 1000
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+et = pytest.importorskip("lxml.etree")
+
+from gameObjects.planet import Planet
+from xmlUtil.xmlreader import XMLReader
+from xmlUtil.xmlwriter import XMLWriter
+
+
+repositoryRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def makeVariant(name: str, variantOf: str, containingFile: str, x: float, y: float) -> Planet:
+    planet = Planet(name)
+    planet.variantOf = variantOf
+    planet.containingFile = containingFile
+    planet.x = x
+    planet.y = y
+    return planet
+
+
+@pytest.fixture
+def xmlWriter(monkeypatch):
+    #XMLWriter reads its campaign template relative to the working directory
+    monkeypatch.chdir(repositoryRoot)
+    XMLReader.clearParseCache()
+    yield XMLWriter()
+    XMLReader.clearParseCache()
+
+
+@pytest.fixture
+def planetFolder(tmp_path):
+    (tmp_path / "Planets.xml").write_text('<Planets><Planet Name="Alpha"><Galactic_Position>1, 2, 10</Galactic_Position></Planet></Planets>')
+    return str(tmp_path) + "/"
+
+
+def test_planetVariantWriter_parsesAndWritesEachFileOnce(xmlWriter, planetFolder, monkeypatch):
+    parsedFiles = []
+    writtenFiles = []
+    parseFile = XMLReader.parseFile
+
+    def countingParseFile(reader, path, **kwargs):
+        parsedFiles.append(path)
+        return parseFile(reader, path, **kwargs)
+
+    monkeypatch.setattr(XMLReader, "parseFile", countingParseFile)
+    monkeypatch.setattr(XMLWriter, "writer", lambda writer, XMLRoot, outputName: writtenFiles.append(outputName))
+
+    variants = [makeVariant("Alpha" + str(i), "Alpha", "Planets.xml", i, i) for i in range(3)]
+    xmlWriter.planetVariantWriter(planetFolder, variants)
+
+    assert parsedFiles == [planetFolder + "Planets.xml"]
+    assert writtenFiles == [planetFolder + "Planets.xml"]
+
+
+def test_planetVariantWriter_appendsAllVariants(xmlWriter, planetFolder):
+    variants = [makeVariant("Alpha" + str(i), "Alpha", "Planets.xml", i, i) for i in range(3)]
+    xmlWriter.planetVariantWriter(planetFolder, variants)
+
+    root = et.parse(planetFolder + "Planets.xml").getroot()
+    assert [planet.get("Name") for planet in root.iter("Planet")] == ["Alpha", "Alpha0", "Alpha1", "Alpha2"]
+    assert root.find("Planet[@Name='Alpha2']/Variant_Of_Existing_Type").text == "Alpha"
+    assert [name for name in os.listdir(planetFolder) if name.endswith(".tmp")] == []
+
+
+def test_planetVariantWriter_leavesCachedTreeUnchanged(xmlWriter, planetFolder):
+    cachedTree = XMLReader().parseFile(planetFolder + "Planets.xml")
+
+    xmlWriter.planetVariantWriter(planetFolder, [makeVariant("Beta", "Alpha", "Planets.xml", 3, 4)])
+
+    assert [planet.get("Name") for planet in cachedTree.iter("Planet")] == ["Alpha"]
+
+
+def test_transaction_keepsMovedPlanetsAndVariantsOfTheSameFile(xmlWriter, planetFolder):
+    xmlWriter.beginTransaction()
+    planetRoots = {"Planets.xml": XMLReader().parseFile(planetFolder + "Planets.xml", useCache = False)}
+    xmlWriter.planetCoordinatesWriter(planetFolder, planetRoots, {"Alpha": [5.0, 6.0]})
+    xmlWriter.planetVariantWriter(planetFolder, [makeVariant("Beta", "Alpha", "Planets.xml", 3, 4)])
+    xmlWriter.commitTransaction()
+
+    root = et.parse(planetFolder + "Planets.xml").getroot()
+    assert root.find("Planet[@Name='Alpha']/Galactic_Position").text == "5.0, 6.0, 10"
+    assert [planet.get("Name") for planet in root.iter("Planet")] == ["Alpha", "Beta"]
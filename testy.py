@@ -1,4 +1,4 @@
-import sys
+import argparse
 
 from PyQt5.QtWidgets import QApplication
 
@@ -13,25 +13,39 @@ from ui.mainwindow_presenter import MainWindow, MainWindowPresenter
 from ui.planetcontextmenu import PlanetContextMenu
 from ui.qtmainwindow import QtMainWindow
 from RepositoryCreator import RepositoryCreator
+from xmlUtil.loadprofiler import LoadProfiler
 
 config: Config = Config()
 
-numArgs = len(sys.argv)
+argumentParser = argparse.ArgumentParser(description = "Galactic Conquest Editor")
+argumentParser.add_argument("path", nargs = "?", help = "Mod Data folder to open, overrides the DataPath config entry")
+argumentParser.add_argument("--no-cache", action = "store_true", help = "Parse all XML files again instead of using the load cache")
+argumentParser.add_argument("--watch", action = "store_true", help = "Apply changes other programs make to the XML files while the editor is open")
+argumentParser.add_argument("--profile-load", action = "store_true", help = "Print the time and counters of each loading phase as JSON")
+arguments = argumentParser.parse_args()
 
-if numArgs > 1:
-    path = sys.argv[1]
-else:
-    path = config.dataPath
+path = config.dataPath
+if arguments.path:
+    path = arguments.path
+
+if arguments.no_cache:
+    config.useLoadCache = False
+
+if arguments.watch:
+    config.watchFiles = True
 
 app = QApplication([])
 
-repositoryCreator: RepositoryCreator = RepositoryCreator()
-repository = repositoryCreator.constructRepository(path)
+loadProfiler: LoadProfiler = LoadProfiler(arguments.profile_load)
+
+repositoryCreator: RepositoryCreator = RepositoryCreator(config.loadingThreads, config.useLoadCache, loadProfiler)
+#Starts out empty, the data folder is swapped into it once it has loaded
+repository = repositoryCreator.repository
 
 dialogFactory = DialogFactory(repository)
 
 qtMainWindow: QtMainWindow = QtMainWindow()
-presenter: MainWindowPresenter = MainWindowPresenter(qtMainWindow, repository, config)
+presenter: MainWindowPresenter = MainWindowPresenter(qtMainWindow, repository, config, repositoryCreator)
 presenter.newTradeRouteCommand = ShowTradeRouteCreatorDialogCommand(presenter, dialogFactory)
 presenter.campaignPropertiesCommand = ShowCampaignCreatorDialogCommand(presenter, dialogFactory)
 presenter.newPlanetVariantCommand = ShowPlanetVariantCreatorDialogCommand(presenter, dialogFactory)
@@ -42,4 +56,7 @@ presenter.showPlanetFileHiderCommand = ShowPlanetFileHiderCommand(presenter, dia
 qtMainWindow.setMainWindowPresenter(presenter)
 qtMainWindow.getWindow().show()
 
+#Loads in the background with a progress dialog, the window stays responsive meanwhile
+presenter.onDataFolderChanged(path)
+
 app.exec_()
@@ -1,5 +1,6 @@
+import bisect
 from abc import ABC, abstractmethod
-from typing import List, Set, Dict
+from typing import Callable, List, Set, Dict
 
 import numpy as np
 from numpy import ndarray as NumPyArray
@@ -12,8 +13,7 @@ from gameObjects.faction import Faction
 from gameObjects.campaign import Campaign
 from ui.galacticplot import GalacticPlot
 from RepositoryCreator import RepositoryCreator
-from xmlUtil.xmlwriter import XMLWriter
-from xmlUtil.xmlreader import XMLReader
+from xmlUtil.savejob import SaveJob, SavedCampaign, SavedPlanet, SavedTradeRoute
 from xmlUtil.xmlstructure import XMLStructure
 
 
@@ -35,6 +35,18 @@ class MainWindow(ABC):
     def addTradeRoutes(self, tradeRoutes: List[str]) -> None:
         raise NotImplementedError()
 
+    @abstractmethod
+    def updateTradeRoutes(self, tradeRoutes: List[str]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def insertPlanet(self, row: int, planet: str, checked: bool) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def insertTradeRoute(self, row: int, tradeRoute: str, checked: bool) -> None:
+        raise NotImplementedError()
+
     @abstractmethod
     def addCampaigns(self, campaigns: List[str]) -> None:
         raise NotImplementedError()
@@ -75,32 +87,57 @@ class MainWindow(ABC):
     def clearTradeRoutes(self) -> None:
         raise NotImplementedError()
 
+    @abstractmethod
+    def runInBackground(self, title: str, task: Callable, onFinished: Callable, onFailed: Callable) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def watchFiles(self, paths: List[str], onChanged: Callable) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def showError(self, title: str, message: str) -> None:
+        raise NotImplementedError()
+
 
 class MainWindowPresenter:
     '''Window display class'''
-    def __init__(self, mainWindow: MainWindow, repository: GameObjectRepository, config: Config):
+    def __init__(self, mainWindow: MainWindow, repository: GameObjectRepository, config: Config, repositoryCreator: RepositoryCreator = None):
         self.__mainWindow: MainWindow = mainWindow
         self.__plot: GalacticPlot = self.__mainWindow.makeGalacticPlot()
-        
-        self.__xmlWriter: XMLWriter = XMLWriter()
 
         self.__repository = repository
-        self.__repositoryCreator = RepositoryCreator()
-        
         self.__config = config
 
+        #The creator that loaded the repository knows its files, which watch mode needs
+        self.__repositoryCreator = repositoryCreator
+        if self.__repositoryCreator is None:
+            self.__repositoryCreator = RepositoryCreator(self.__config.loadingThreads, self.__config.useLoadCache)
+        #Loaded data folders are swapped into the repository the dialogs already hold
+        self.__repositoryCreator.repository = self.__repository
+        self.__loading: bool = False
+
         self.campaigns: List[Campaign] = list()
         self.__planets: List[Planet] = list()
         self.__visiblePlanets: List[Planet] = list()
+        self.__visiblePlanetSet: Set[Planet] = set()
         self.__tradeRoutes: List[TradeRoute] = list()
         self.__availableTradeRoutes: List[TradeRoute] = list()
         self.__newTradeRoutes: List[TradeRoute] = list()
         self.__newPlanetVariants: List[Planet] = list()
         self.__updatedPlanetCoords: Dict[str, List[float]] = dict()
+        #Planet files containing a planet whose coordinates changed since the last save
+        self.__dirtyPlanetFiles: Set[str] = set()
+        #Pending changes handed over to the running save, given back if it fails. None if no save is running
+        self.__savingChanges: tuple = None
 
         self.__planetFileBlacklist: List[String] = []
         self.__planetPlotIndexToRepoIndexMap: List[int] = list()
 
+        #Row of each planet in the planet table and of each available trade route in the trade route table
+        self.__planetRows: Dict[Planet, int] = dict()
+        self.__tradeRouteRows: Dict[TradeRoute, int] = dict()
+
         self.__selectedCampaignIndex: int = 0
 
         self.__checkedPlanets: Set[Planet] = set()
@@ -108,10 +145,20 @@ class MainWindowPresenter:
         
         self.__showAutoConnections = True
 
+        #Batch updates: while __batchDepth > 0, route, combo box and plot updates are only flagged and run once at the end
+        self.__batchDepth: int = 0
+        self.__pendingAvailableTradeRoutesPlanets = None
+        self.__planetComboBoxDirty: bool = False
+        self.__galacticPlotDirty: bool = False
+
+        self.__plot.setFrameBudget(self.__config.frameBudget)
+        self.__plot.setLevelOfDetailThreshold(self.__config.levelOfDetailThreshold)
         self.__plot.planetSelectedSignal.connect(self.planetSelectedOnPlot)
         self.__plot.planetDraggedSignal.connect(self.planetDraggedOnPlot)
+        self.__plot.planetMovingSignal.connect(self.planetMovingOnPlot)
 
         self.__updateWidgets()
+        self.__watchDataFolder()
 
         self.newTradeRouteCommand = None
         self.campaignPropertiesCommand = None
@@ -119,12 +166,90 @@ class MainWindowPresenter:
 
 
     def onDataFolderChanged(self, folder: str) -> None:
-        '''Updates the repository and refreshes the main window when a new data folder is selected'''
-        self.__repository.emptyRepository()
-        self.__repository = self.__repositoryCreator.constructRepository(folder)
-        XMLStructure.dataFolder = folder
+        '''Loads a newly selected data folder in the background. The current data stays shown
+        until the load has finished, and is kept if the load is cancelled or fails'''
+        self.__startLoading(folder, False)
+
+    def __startLoading(self, folder: str, keepPendingEdits: bool) -> None:
+        '''Loads a data folder in the background. keepPendingEdits applies the unsaved edits
+        to the loaded data again, for reloads of the current folder'''
+        if self.__loading:
+            print("A data folder is already loading")
+            return
+
+        self.__loading = True
+        loadTask = lambda progress, isCancelled: self.__repositoryCreator.loadRepository(folder, progress, isCancelled)
+        onFinished = lambda repository: self.__onLoadFinished(repository, folder, keepPendingEdits)
+        self.__mainWindow.runInBackground("Loading", loadTask, onFinished, self.__onLoadFailed)
+
+    def __onLoadFinished(self, repository: GameObjectRepository, folder: str, keepPendingEdits: bool) -> None:
+        '''Swaps in a loaded repository and refreshes the main window. None means the load was cancelled'''
+        self.__loading = False
+        if repository is None:
+            print("Loading cancelled")
+            return
+
+        selectedName = None
+        if keepPendingEdits and len(self.campaigns) > 0:
+            selectedName = self.campaigns[self.__selectedCampaignIndex].name
+
+        self.__repositoryCreator.swapInRepository(repository, folder)
+        if self.__repositoryCreator.profiler.enabled:
+            print(self.__repositoryCreator.profiler.reportJSON())
+
+        newTradeRoutes, updatedPlanetCoords, newPlanetVariants = self.__newTradeRoutes, self.__updatedPlanetCoords, self.__newPlanetVariants
+        self.__newTradeRoutes = []
+        self.__updatedPlanetCoords = dict()
+        self.__dirtyPlanetFiles = set()
+        self.__newPlanetVariants = []
+
+        #Otherwise the pending edits belong to the game objects of the previous folder
+        if keepPendingEdits:
+            self.__reapplyPendingEdits(newTradeRoutes, updatedPlanetCoords, newPlanetVariants)
+
+        campaignNames = sorted(self.__getNames(self.__repository.campaigns))
+        self.__selectedCampaignIndex = campaignNames.index(selectedName) if selectedName in campaignNames else 0
+        self.__plot.invalidateSpatialIndex()
 
         self.__updateWidgets()
+        self.__watchDataFolder()
+
+    def __reapplyPendingEdits(self, newTradeRoutes: List[TradeRoute], updatedPlanetCoords: Dict[str, List[float]],
+            newPlanetVariants: List[Planet]) -> None:
+        '''Applies unsaved edits made before a reload to the reloaded game objects, matching them by name.
+        New variants and trade routes that the reloaded files do not contain are added again'''
+        for planet in newPlanetVariants:
+            if not self.__repository.planetExists(planet.name):
+                self.__repository.addPlanet(planet)
+                self.__newPlanetVariants.append(planet)
+
+        for tradeRoute in newTradeRoutes:
+            if self.__repository.findTradeRouteIgnoreCase(tradeRoute.name) is not None:
+                continue
+
+            start = self.__repository.findPlanetIgnoreCase(tradeRoute.start.name)
+            end = self.__repository.findPlanetIgnoreCase(tradeRoute.end.name)
+            if start is None or end is None:
+                print("Trade route " + tradeRoute.name + " dropped, its planets no longer exist")
+                continue
+
+            tradeRoute.start = start
+            tradeRoute.end = end
+            self.__repository.addTradeRoute(tradeRoute)
+            self.__newTradeRoutes.append(tradeRoute)
+
+        for name, coords in updatedPlanetCoords.items():
+            if self.__repository.planetExists(name):
+                planet = self.__repository.getPlanetByName(name)
+                planet.x, planet.y = coords
+                self.__updatedPlanetCoords[name] = coords
+                self.__dirtyPlanetFiles.add(planet.containingFile)
+
+    def __onLoadFailed(self, message: str) -> None:
+        '''Called when the background load failed, the current data is kept'''
+        self.__loading = False
+        print("Loading failed: " + message)
+        self.__mainWindow.showError("Loading failed", message)
 
     def onPlanetChecked(self, index: int, checked: bool) -> None:
         '''If a planet is checked by the user, add it to the selected campaign and refresh the galaxy plot'''
@@ -139,11 +264,13 @@ class MainWindowPresenter:
                 self.campaigns[self.__selectedCampaignIndex].planets.remove(self.__planets[index])
                 self.__updateAvailableTradeRoutes(self.__checkedPlanets)
 
-        self.__mainWindow.updatePlanetComboBox(self.__getNames(self.__checkedPlanets))
+        self.__updatePlanetComboBox()
         self.__updateGalacticPlot()
     
     def planetSelectedOnPlot(self, plotIndexes: list) -> None:
         '''If a planet is checked by the user, add it to the selected campaign and refresh the galaxy plot'''
+        self.beginBatchUpdate()
+
         for plotInd in plotIndexes:
             index = self.__planetPlotIndexToRepoIndex(plotInd)
             if self.__planets[index] not in self.__checkedPlanets:
@@ -158,17 +285,24 @@ class MainWindowPresenter:
         selectedPlanets = []
 
         for p in self.__checkedPlanets:
-            selectedPlanets.append(self.__getNames(self.__planets).index(p.name))
+            selectedPlanets.append(self.__planetRows[p])
 
         self.__mainWindow.updatePlanetSelection(selectedPlanets)
-        self.__mainWindow.updatePlanetComboBox(self.__getNames(self.__checkedPlanets))
+        self.__updatePlanetComboBox()
         self.__updateGalacticPlot()
+
+        self.endBatchUpdate()
     
     def planetDraggedOnPlot(self, planetIndexes: list, position: tuple):
         '''Move a planet if it is dragged on the plot'''
-        for index in planetIndexes:
-            index = self.__planetPlotIndexToRepoIndex(index)
-            self.__changePlanetPosition(self.__planets[index], position[0], position[1])
+        planets = [self.__planets[self.__planetPlotIndexToRepoIndex(index)] for index in planetIndexes]
+        self.__setPlanetPositions(planets, position[0], position[1])
+        self.__updateGalacticPlot()
+
+    def planetMovingOnPlot(self, planetIndexes: list, position: tuple):
+        '''Keep the repository up to date while a planet is dragged. The plot draws the drag itself'''
+        planets = [self.__planets[self.__planetPlotIndexToRepoIndex(index)] for index in planetIndexes]
+        self.__setPlanetPositions(planets, position[0], position[1])
     
 
     def onTradeRouteChecked(self, index: int, checked: bool) -> None:
@@ -184,6 +318,56 @@ class MainWindowPresenter:
 
         self.__updateGalacticPlot()
 
+    def onWatchedFilesChanged(self, paths: List[str]) -> None:
+        '''Applies changes made to the data folder by other programs. Only the changed files are read again,
+        and the widgets are only rebuilt if more than planet positions changed'''
+        if self.__loading:
+            return
+
+        changes = set()
+        for path in paths:
+            fileChanges = self.__repositoryCreator.reloadFile(path)
+            if fileChanges is None:
+                #A meta file changed, the set of files itself may be different. Unsaved edits are kept
+                self.__startLoading(XMLStructure.dataFolder, True)
+                return
+
+            changes |= fileChanges
+
+        if len(changes) == 0:
+            return
+
+        #Routes deleted on disk are not written back by the next save
+        if "tradeRoutes" in changes:
+            self.__dropRemovedTradeRoutes()
+
+        self.__plot.invalidateSpatialIndex()
+        if changes == {"coordinates"}:
+            self.__updateGalacticPlot()
+            return
+
+        #Keep the selected campaign selected, its position in the sorted list may have changed
+        selectedName = self.campaigns[self.__selectedCampaignIndex].name
+        campaignNames = sorted(self.__getNames(self.__repository.campaigns))
+        self.__selectedCampaignIndex = campaignNames.index(selectedName) if selectedName in campaignNames else 0
+
+        self.__updateWidgets()
+
+    def __dropRemovedTradeRoutes(self) -> None:
+        '''Forgets unsaved trade routes that are no longer in the repository, also those of a running save'''
+        tradeRoutes = self.__repository.tradeRoutes
+        self.__newTradeRoutes = [t for t in self.__newTradeRoutes if t in tradeRoutes]
+
+        if self.__savingChanges is not None:
+            newTradeRoutes, updatedPlanetCoords, dirtyPlanetFiles, newPlanetVariants = self.__savingChanges
+            newTradeRoutes = [t for t in newTradeRoutes if t in tradeRoutes]
+            self.__savingChanges = (newTradeRoutes, updatedPlanetCoords, dirtyPlanetFiles, newPlanetVariants)
+
+    def __watchDataFolder(self) -> None:
+        '''Starts watching the files of the current data folder if watch mode is on'''
+        if self.__config.watchFiles:
+            self.__mainWindow.watchFiles(self.__repositoryCreator.watchedFiles(), self.onWatchedFilesChanged)
+
     def onCampaignSelected(self, index: int) -> None:
         '''If a campaign is selected by the user, clear then refresh the galaxy plot'''
         self.__checkedPlanets.clear()
@@ -196,7 +380,7 @@ class MainWindowPresenter:
         
         self.__updateAvailableTradeRoutes(self.campaigns[index].planets)
 
-        self.__mainWindow.updatePlanetComboBox(self.__getNames(self.__checkedPlanets))
+        self.__updatePlanetComboBox()
         self.__updateGalacticPlot()
 
     def onNewCampaign(self, campaign: Campaign) -> None:
@@ -208,15 +392,19 @@ class MainWindowPresenter:
         self.__mainWindow.updateCampaignComboBox(self.__getNames(self.campaigns), campaign.name)
 
     def onNewTradeRoute(self, tradeRoute: TradeRoute):
-        '''Handles new trade routes'''
+        '''Handles new trade routes. The route is inserted as a single checked row instead of rebuilding the widgets'''
         self.__repository.addTradeRoute(tradeRoute)
         self.__newTradeRoutes.append(tradeRoute)
 
-        if tradeRoute.start in self.__checkedPlanets or tradeRoute.end in self.__checkedPlanets:
-            self.__checkedTradeRoutes.add(tradeRoute)
-
+        self.__checkedTradeRoutes.add(tradeRoute)
         self.campaigns[self.__selectedCampaignIndex].tradeRoutes.add(tradeRoute)
-        self.__updateWidgets()
+
+        self.__insertSorted(self.__tradeRoutes, tradeRoute)
+        row = self.__insertSorted(self.__availableTradeRoutes, tradeRoute)
+        self.__tradeRouteRows = self.__getRows(self.__availableTradeRoutes)
+        self.__mainWindow.insertTradeRoute(row, tradeRoute.name, True)
+
+        self.__updateGalacticPlot()
 
     def onAutoConnectionSettingChanged(self, newAutoConnectionDistance, showAutoConnections):
         self.__config.autoPlanetConnectionDistance = newAutoConnectionDistance
@@ -224,14 +412,20 @@ class MainWindowPresenter:
         self.__updateGalacticPlot()
 
     def onNewPlanetVariant(self, planet: Planet):
-        '''Handles new trade routes'''
+        '''Handles new planet variants. The planet is inserted as a single checked row instead of rebuilding the widgets'''
         self.__repository.addPlanet(planet)
         self.__newPlanetVariants.append(planet)
 
         self.__checkedPlanets.add(planet)
-
         self.campaigns[self.__selectedCampaignIndex].planets.add(planet)
-        self.__updateWidgets()
+
+        row = self.__insertSorted(self.__planets, planet)
+        self.__planetRows = self.__getRows(self.__planets)
+        self.__determineVisiblePlanetsAndIndexes()
+        self.__mainWindow.insertPlanet(row, planet.name, True)
+
+        self.__updatePlanetComboBox()
+        self.__updateGalacticPlot()
 
     def onPlanetPositionChanged(self, name, new_x, new_y) -> None:
         '''Updates position of a planet in the repository'''
@@ -240,17 +434,21 @@ class MainWindowPresenter:
 
     def allPlanetsChecked(self, checked: bool) -> None:
         '''Select all planets handler: plots all planets'''
+        self.beginBatchUpdate()
+
         if checked:
             self.__checkedPlanets.update(self.__planets)
-            self.campaigns[self.__selectedCampaignIndex].planets.update(self.__availableTradeRoutes)
+            self.campaigns[self.__selectedCampaignIndex].planets.update(self.__planets)
         else:
             self.__checkedPlanets.clear()
             self.campaigns[self.__selectedCampaignIndex].planets.clear()
 
-        self.__mainWindow.updatePlanetComboBox(self.__getNames(self.__checkedPlanets))
+        self.__updatePlanetComboBox()
         self.__updateAvailableTradeRoutes(self.__checkedPlanets)
         self.__updateGalacticPlot()
 
+        self.endBatchUpdate()
+
     def allTradeRoutesChecked(self, checked: bool) -> None:
         '''Select all trade routes handler: plots all trade routes'''
         if checked:
@@ -263,28 +461,85 @@ class MainWindowPresenter:
         self.__updateGalacticPlot()  
 
     def saveFile(self, fileName: str) -> None:
-        '''Saves XML files'''
+        '''Saves XML files in the background. The pending changes are copied for the save and
+        cleared, editing can go on while it runs'''
+        if self.__savingChanges is not None:
+            print("A save is already running")
+            return
+
+        if len(self.campaigns) == 0:
+            print("No campaign to save")
+            return
+
         campaign = self.campaigns[self.__selectedCampaignIndex]
-        self.__xmlWriter.campaignWriter(campaign, fileName)
+        saveJob = SaveJob(XMLStructure.dataFolder + "/XML/", fileName, SavedCampaign.of(campaign),
+            tuple(SavedTradeRoute.of(t) for t in self.__newTradeRoutes), self.__updatedPlanetCoords,
+            tuple(sorted(self.__dirtyPlanetFiles)), tuple(SavedPlanet.of(p) for p in self.__newPlanetVariants),
+            self.__config.loadingThreads)
+
+        self.__savingChanges = (self.__newTradeRoutes, self.__updatedPlanetCoords, self.__dirtyPlanetFiles, self.__newPlanetVariants)
+        self.__newTradeRoutes = []
+        self.__updatedPlanetCoords = dict()
+        self.__dirtyPlanetFiles = set()
+        self.__newPlanetVariants = []
+        self.__updateGalacticPlot()
 
-        if len(self.__newTradeRoutes) > 0:
-            self.__xmlWriter.tradeRouteWriter(self.__newTradeRoutes)
-            self.__newTradeRoutes = []
-
-        if len(self.__updatedPlanetCoords) > 0:
-            xmlReader = XMLReader()
-            gameObjectFile = XMLStructure.dataFolder + "/XML/GameObjectFiles.XML"
-            planetRoots = xmlReader.findPlanetFilesAndRoots(gameObjectFile)
-            self.__xmlWriter.planetCoordinatesWriter(XMLStructure.dataFolder + "/XML/", planetRoots, self.__updatedPlanetCoords)
-            self.__updatedPlanetCoords = []
-        
-        if len(self.__newPlanetVariants) > 0:
-            xmlFolder = XMLStructure.dataFolder + "/XML/"
-            self.__xmlWriter.planetVariantWriter(xmlFolder, self.__newPlanetVariants)
-            self.__newPlanetVariants = []
+        self.__mainWindow.runInBackground("Saving", saveJob.run, self.__onSaveFinished, self.__onSaveFailed)
+
+    def __onSaveFinished(self, writtenFiles: List[str]) -> None:
+        '''Called when the background save has ended. None means it was cancelled before writing anything'''
+        if writtenFiles is None:
+            print("Save cancelled")
+            self.__restoreSavingChanges()
+            return
+
+        self.__savingChanges = None
+
+    def __onSaveFailed(self, message: str) -> None:
+        '''Called when the background save failed, no file was written'''
+        print("Save failed: " + message)
+        self.__mainWindow.showError("Save failed", "No file was changed.\n\n" + message)
+        self.__restoreSavingChanges()
+
+    def __restoreSavingChanges(self) -> None:
+        '''Puts the changes of a save that did not complete back in front of those made since it started'''
+        newTradeRoutes, updatedPlanetCoords, dirtyPlanetFiles, newPlanetVariants = self.__savingChanges
+        self.__savingChanges = None
+
+        self.__newTradeRoutes = newTradeRoutes + [t for t in self.__newTradeRoutes if t not in newTradeRoutes]
+        for name, coords in updatedPlanetCoords.items():
+            self.__updatedPlanetCoords.setdefault(name, coords)
+        self.__dirtyPlanetFiles |= dirtyPlanetFiles
+        self.__newPlanetVariants = newPlanetVariants + [p for p in self.__newPlanetVariants if p not in newPlanetVariants]
+        self.__updateGalacticPlot()
+
+    def beginBatchUpdate(self) -> None:
+        '''Starts a bulk change: trade route, planet combo box and plot updates are deferred until the
+        matching endBatchUpdate, which runs each of them at most once. Batches can be nested'''
+        self.__batchDepth += 1
+
+    def endBatchUpdate(self) -> None:
+        '''Ends a bulk change and runs the updates that were requested during it'''
+        self.__batchDepth -= 1
+        if self.__batchDepth > 0:
+            return
+
+        if self.__pendingAvailableTradeRoutesPlanets is not None:
+            planetList = self.__pendingAvailableTradeRoutesPlanets
+            self.__pendingAvailableTradeRoutesPlanets = None
+            self.__updateAvailableTradeRoutes(planetList)
+
+        if self.__planetComboBoxDirty:
+            self.__planetComboBoxDirty = False
+            self.__updatePlanetComboBox()
+
+        if self.__galacticPlotDirty:
+            self.__galacticPlotDirty = False
+            self.__updateGalacticPlot()
 
     def onPlanetFileBlacklistUpdated(self, updatedBlackList):
         self.__planetFileBlacklist = updatedBlackList
+        self.__determineVisiblePlanetsAndIndexes()
         self.__updateGalacticPlot()
 
     def getNameOfPlanetAt(self, ind: int) -> str:
@@ -301,14 +556,37 @@ class MainWindowPresenter:
         '''Returns the name attribute from a list of GameObjects'''
         return [x.name for x in inputList]
 
+    def __getRows(self, inputList: list) -> dict:
+        '''Returns a dictionary of GameObjects and their row in a list'''
+        return {x: row for row, x in enumerate(inputList)}
+
+    def __insertSorted(self, gameObjects: list, gameObject) -> int:
+        '''Inserts a GameObject into a list sorted by name and returns its row'''
+        row = bisect.bisect_right(self.__getNames(gameObjects), gameObject.name)
+        gameObjects.insert(row, gameObject)
+        return row
+
     def __updateWidgets(self) -> None:
         '''Update the main window widgets'''
         self.campaigns: List[Campaign] = sorted(self.__repository.campaigns, key = lambda entry: entry.name)
         self.__planets: List[Planet] = sorted(self.__repository.planets, key = lambda entry: entry.name)
+        self.__planetRows = self.__getRows(self.__planets)
         self.__determineVisiblePlanetsAndIndexes()
         self.__tradeRoutes: List[TradeRoute] = sorted(self.__repository.tradeRoutes, key = lambda entry: entry.name)
         self.__factions: List[Faction] = sorted(self.__repository.factions, key = lambda entry: entry.name)
 
+        #Nothing is loaded yet, e.g. while the first data folder loads in the background
+        if len(self.campaigns) == 0:
+            self.__availableTradeRoutes = []
+            self.__tradeRouteRows = dict()
+            self.__checkedPlanets.clear()
+            self.__checkedTradeRoutes.clear()
+            self.__mainWindow.emptyWidgets()
+            self.__mainWindow.addPlanets(self.__getNames(self.__planets))
+            self.__updatePlanetComboBox()
+            self.__updateGalacticPlot()
+            return
+
         self.__updateAvailableTradeRoutes(self.campaigns[self.__selectedCampaignIndex].planets)
 
         self.__mainWindow.emptyWidgets()
@@ -320,7 +598,7 @@ class MainWindowPresenter:
         self.__mainWindow.updateCampaignComboBoxSelection(self.__selectedCampaignIndex)
         self.onCampaignSelected(self.__selectedCampaignIndex)
 
-        self.__mainWindow.updatePlanetComboBox(self.__getNames(self.__checkedPlanets))
+        self.__updatePlanetComboBox()
 
         self.__updateSelectedTradeRoutes(self.__selectedCampaignIndex)
 
@@ -333,7 +611,7 @@ class MainWindowPresenter:
         self.__checkedPlanets.update(self.campaigns[index].planets)
 
         for p in self.__checkedPlanets:
-            selectedPlanets.append(self.__planets.index(p))
+            selectedPlanets.append(self.__planetRows[p])
 
         self.__mainWindow.updatePlanetSelection(selectedPlanets)
 
@@ -344,19 +622,20 @@ class MainWindowPresenter:
         self.__checkedTradeRoutes = self.campaigns[index].tradeRoutes.intersection(self.__availableTradeRoutes)
             
         for t in self.__checkedTradeRoutes:
-            selectedTradeRoutes.append(self.__availableTradeRoutes.index(t))
+            selectedTradeRoutes.append(self.__tradeRouteRows[t])
 
         self.__mainWindow.updateTradeRouteSelection(selectedTradeRoutes)
 
     def __updateAvailableTradeRoutes(self, planetList:  list):
         '''Updates the list of available trade routes based on the planets in the GC'''
+        if self.__batchDepth > 0:
+            self.__pendingAvailableTradeRoutesPlanets = planetList
+            return
+
         privateAvailableTradeRoutes = set()
 
         if planetList is not None:
-            for planet in planetList:
-                for route in self.__tradeRoutes:
-                    if route.start == planet or route.end == planet:
-                        privateAvailableTradeRoutes.add(route)
+            privateAvailableTradeRoutes = self.__repository.getTradeRoutesOfPlanets(planetList)
         
         if len(self.__newTradeRoutes) > 0:
             #Ensure any new routes are appended to the available list for immediate use
@@ -365,34 +644,57 @@ class MainWindowPresenter:
         self.campaigns[self.__selectedCampaignIndex].tradeRoutes = self.campaigns[self.__selectedCampaignIndex].tradeRoutes.intersection(privateAvailableTradeRoutes)
         
         self.__availableTradeRoutes = sorted(privateAvailableTradeRoutes, key = lambda entry: entry.name)
+        self.__tradeRouteRows = self.__getRows(self.__availableTradeRoutes)
         self.__mainWindow.updateTradeRoutes(self.__getNames(self.__availableTradeRoutes))
         self.__updateSelectedTradeRoutes(self.__selectedCampaignIndex)
     
+    def __updatePlanetComboBox(self) -> None:
+        '''Shows the checked planets in the planet combo box'''
+        if self.__batchDepth > 0:
+            self.__planetComboBoxDirty = True
+            return
+
+        self.__mainWindow.updatePlanetComboBox(self.__getNames(self.__checkedPlanets))
+
     def __updateGalacticPlot(self):
+        if self.__batchDepth > 0:
+            self.__galacticPlotDirty = True
+            return
+
         autoConnectionDistance = self.config.autoPlanetConnectionDistance
         if not self.__showAutoConnections:
             autoConnectionDistance = 0
-        self.__determineVisiblePlanetsAndIndexes()
         
-        self.__plot.plotGalaxy(self.__checkedPlanets.intersection(self.__visiblePlanets), self.__checkedTradeRoutes, self.__visiblePlanets, autoConnectionDistance)
+        self.__plot.plotGalaxy(self.__checkedPlanets.intersection(self.__visiblePlanetSet), self.__checkedTradeRoutes, self.__visiblePlanets, autoConnectionDistance, self.__newTradeRoutes)
     
     def __planetPlotIndexToRepoIndex(self, ind):
         return self.__planetPlotIndexToRepoIndexMap[ind]
     
     def __determineVisiblePlanetsAndIndexes(self):
+        '''Rebuilds the visible planet list and the plot index to row map. Only needed when the planet
+        list or the file blacklist changes'''
+        blacklist = set(self.__planetFileBlacklist)
         self.__visiblePlanets = []
         self.__planetPlotIndexToRepoIndexMap = []
         for i in range(len(self.__planets)):
             p = self.__planets[i]
-            if not p.containingFile in self.__planetFileBlacklist:
+            if not p.containingFile in blacklist:
                 self.__planetPlotIndexToRepoIndexMap.append(i)
                 self.__visiblePlanets.append(p)
+        self.__visiblePlanetSet = set(self.__visiblePlanets)
     
     def __changePlanetPosition(self, planet, new_x, new_y):
-        planet.x = np.around(new_x, 1)
-        planet.y = np.around(new_y, 1)
-        self.__updatedPlanetCoords[planet.name] = [planet.x, planet.y]
-        self.__updateGalacticPlot()  
+        self.__setPlanetPositions([planet], new_x, new_y)
+        self.__updateGalacticPlot()
+
+    def __setPlanetPositions(self, planets, new_x, new_y):
+        '''Moves planets to one position and records the new coordinates for saving, without replotting'''
+        new_x, new_y = np.around((new_x, new_y), 1)
+        self.__repository.setPlanetPositions(planets, new_x, new_y)
+        for planet in planets:
+            self.__updatedPlanetCoords[planet.name] = [planet.x, planet.y]
+            self.__dirtyPlanetFiles.add(planet.containingFile)
+        self.__plot.invalidateSpatialIndex()
     
     @property
     def config(self):
@@ -0,0 +1,37 @@
+from typing import Callable
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class QtBackgroundTaskSignals(QObject):
+    '''Signals of a QtBackgroundTask. They are emitted on the worker thread and delivered on the GUI thread'''
+    progress = pyqtSignal(int, int, str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class QtBackgroundTask(QRunnable):
+    '''Runs task(progress, isCancelled) on a QThreadPool thread. The task reports progress by calling
+        progress(done, total, text) and should stop early once isCancelled() returns True'''
+    def __init__(self, task: Callable):
+        super(QtBackgroundTask, self).__init__()
+        self.setAutoDelete(False)
+        self.signals: QtBackgroundTaskSignals = QtBackgroundTaskSignals()
+        self.__task: Callable = task
+        self.__cancelled: bool = False
+
+    def cancel(self) -> None:
+        '''Asks the task to stop, it decides itself when it is safe to'''
+        self.__cancelled = True
+
+    def isCancelled(self) -> bool:
+        return self.__cancelled
+
+    def run(self) -> None:
+        try:
+            result = self.__task(self.signals.progress.emit, self.isCancelled)
+        except Exception as error:
+            self.signals.failed.emit(str(error))
+            return
+
+        self.signals.finished.emit(result)
@@ -44,8 +44,7 @@ class QtCampaignProperties:
     def show(self, name = -1) -> DialogResult:
         '''Display dialog modally'''
         if name is not -1:
-            campaignList = list(self.__repository.campaigns)
-            campaign = next((x for x in campaignList if x.name == name), None)
+            campaign = self.__repository.getCampaignByName(name)
             if campaign is not None:
                 self.__inputName.setText(campaign.name)
                 self.__inputSetName.setText(campaign.setName)
@@ -0,0 +1,109 @@
+from typing import List
+
+from PyQt5 import QtCore
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, pyqtSignal
+
+
+class QtCheckListModel(QAbstractTableModel):
+    '''Single column table model of names with a check box each.
+        Views only ask for the rows they show, and check states are kept in a flag array
+        instead of one item object per row'''
+    #signal emitted when the user toggles the check box of a row
+    checkStateToggled = pyqtSignal(int, bool)
+
+    def __init__(self, header: str = "Empty"):
+        super(QtCheckListModel, self).__init__()
+        self.__header: str = header
+        self.__entries: List[str] = []
+        self.__checked: bytearray = bytearray()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.__entries)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return 1
+
+    def data(self, index: QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == QtCore.Qt.DisplayRole:
+            return self.__entries[index.row()]
+
+        if role == QtCore.Qt.CheckStateRole:
+            return QtCore.Qt.Checked if self.__checked[index.row()] else QtCore.Qt.Unchecked
+
+        return None
+
+    def setData(self, index: QModelIndex, value, role: int = QtCore.Qt.EditRole) -> bool:
+        '''Called by the view when the user toggles a check box'''
+        if not index.isValid() or role != QtCore.Qt.CheckStateRole:
+            return False
+
+        checked = value == QtCore.Qt.Checked
+        self.__checked[index.row()] = checked
+        self.dataChanged.emit(index, index, [QtCore.Qt.CheckStateRole])
+        self.checkStateToggled.emit(index.row(), checked)
+        return True
+
+    def headerData(self, section: int, orientation, role: int = QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.__header
+        return None
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsUserCheckable | QtCore.Qt.ItemIsEnabled
+
+    def setEntries(self, entries: List[str]) -> None:
+        '''Replaces all rows with unchecked entries'''
+        self.beginResetModel()
+        self.__entries = list(entries)
+        self.__checked = bytearray(len(self.__entries))
+        self.endResetModel()
+
+    def appendEntries(self, entries: List[str]) -> None:
+        '''Adds unchecked entries after the last row'''
+        if len(entries) == 0:
+            return
+
+        first = len(self.__entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self.__entries.extend(entries)
+        self.__checked.extend(bytes(len(entries)))
+        self.endInsertRows()
+
+    def insertEntry(self, row: int, entry: str, checked: bool = False) -> None:
+        '''Inserts a single entry at row'''
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.__entries.insert(row, entry)
+        self.__checked.insert(row, checked)
+        self.endInsertRows()
+
+    def isChecked(self, row: int) -> bool:
+        return bool(self.__checked[row])
+
+    def setCheckedRows(self, rows: List[int]) -> None:
+        '''Checks exactly the given rows, notifying views once'''
+        self.__checked = bytearray(len(self.__entries))
+        for row in rows:
+            self.__checked[row] = True
+        self.__checkStatesChanged()
+
+    def setAllChecked(self, checked: bool) -> None:
+        '''Checks or unchecks every row, notifying views once'''
+        if checked:
+            self.__checked = bytearray(b"\x01" * len(self.__entries))
+        else:
+            self.__checked = bytearray(len(self.__entries))
+        self.__checkStatesChanged()
+
+    def __checkStatesChanged(self) -> None:
+        '''Tells views that the check state of every row may have changed'''
+        if len(self.__entries) > 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.__entries) - 1, 0), [QtCore.Qt.CheckStateRole])
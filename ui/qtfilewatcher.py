@@ -0,0 +1,53 @@
+import os
+from typing import Callable, List, Set
+
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer
+
+
+class QtFileWatcher(QObject):
+    '''Watches files for changes and reports them in batches. Every change restarts the debounce
+        interval, so a burst of changes is reported once, after the files have been quiet for that long'''
+    def __init__(self, debounceInterval: int = 500):
+        super(QtFileWatcher, self).__init__()
+        self.__watcher: QFileSystemWatcher = QFileSystemWatcher(self)
+        self.__watcher.fileChanged.connect(self.__fileChanged)
+
+        self.__timer: QTimer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setInterval(debounceInterval)
+        self.__timer.timeout.connect(self.__report)
+
+        self.__paths: List[str] = []
+        self.__changedPaths: Set[str] = set()
+        self.__onChanged: Callable[[List[str]], None] = None
+
+    def watch(self, paths: List[str], onChanged: Callable[[List[str]], None]) -> None:
+        '''Replaces the watched files. onChanged(paths) is called with the files changed in each burst'''
+        self.__timer.stop()
+        self.__changedPaths.clear()
+        if len(self.__watcher.files()) > 0:
+            self.__watcher.removePaths(self.__watcher.files())
+
+        self.__paths = list(paths)
+        self.__onChanged = onChanged
+        self.__addMissingPaths()
+
+    def __fileChanged(self, path: str) -> None:
+        self.__changedPaths.add(path)
+        self.__timer.start()
+
+    def __report(self) -> None:
+        changedPaths = sorted(self.__changedPaths)
+        self.__changedPaths.clear()
+
+        #Files replaced by renaming another file over them are dropped from the watcher
+        self.__addMissingPaths()
+
+        if self.__onChanged is not None and len(changedPaths) > 0:
+            self.__onChanged(changedPaths)
+
+    def __addMissingPaths(self) -> None:
+        watchedPaths = set(self.__watcher.files())
+        missingPaths = [path for path in self.__paths if path not in watchedPaths and os.path.exists(path)]
+        if len(missingPaths) > 0:
+            self.__watcher.addPaths(missingPaths)
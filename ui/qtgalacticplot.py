@@ -1,8 +1,16 @@
+import math
+import time
+
 from PyQt5.QtWidgets import QVBoxLayout, QWidget
 from PyQt5.QtCore import pyqtSignal
 from matplotlib.backends.backend_qt5agg import FigureCanvas, \
     NavigationToolbar2QT as NavigationToolbar
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Axes, Figure
+import numpy as np
+
+from ui.qtredrawscheduler import QtRedrawScheduler
+from ui.spatialindex import SpatialIndex
 
 
 class QtGalacticPlot(QWidget):
@@ -10,6 +18,8 @@ class QtGalacticPlot(QWidget):
     #signal to send to main window presenter when a planet is selected in the plot
     planetSelectedSignal = pyqtSignal(list)
     planetDraggedSignal = pyqtSignal(list, tuple)
+    #signal sent at a limited rate while a planet is being dragged, planetDraggedSignal follows on release
+    planetMovingSignal = pyqtSignal(list, tuple)
 
     def __init__(self, parent: QWidget = None):
         super(QtGalacticPlot, self).__init__()
@@ -18,9 +28,12 @@ class QtGalacticPlot(QWidget):
 
         self.__galacticPlotCanvas: FigureCanvas = FigureCanvas(Figure())
 
-        self.__galacticPlotCanvas.mpl_connect('pick_event', self.__planetSelect)
+        self.__galacticPlotCanvas.mpl_connect('button_press_event', self.__planetSelect)
         self.__galacticPlotCanvas.mpl_connect('button_release_event', self.__buttonReleased)
+        self.__galacticPlotCanvas.mpl_connect('motion_notify_event', self.__planetMoved)
         self.__galacticPlotCanvas.mpl_connect('motion_notify_event', self.__planetHover)
+        self.__galacticPlotCanvas.mpl_connect('draw_event', self.__canvasDrawn)
+        self.__galacticPlotCanvas.mpl_connect('resize_event', self.__viewChanged)
 
         self.__galacticPlotNavBar: NavigationToolbar = NavigationToolbar(self.__galacticPlotCanvas, self.__galacticPlotWidget)
         self.__galacticPlotWidget.layout().addWidget(self.__galacticPlotNavBar)
@@ -29,65 +42,367 @@ class QtGalacticPlot(QWidget):
 
         self.__annotate = self.__axes.annotate("", xy = (0,0), xytext = (10, 10), textcoords = "offset points", bbox = dict(boxstyle="round", fc="w"), arrowprops = dict(arrowstyle="->"))
         self.__annotate.set_visible(False)
+        #The annotation is not part of full draws, it is blitted over the background of the last one
+        self.__annotate.set_animated(True)
+        self.__annotationBackground = None
+        self.__annotatedIndexes = []
         self.__planetNames = []
+        self.__allPlanets = []
+        self.__planetIndexes = dict()
         self.__planetsScatter = None
         self.picked_planet_index = None
+        self.pick_pos = None
 
-    def plotGalaxy(self, planets, tradeRoutes, allPlanets, autoPlanetConnectionDistance: int = 0) -> None:
-        '''Plots all planets as alpha = 0.1, then overlays all selected planets and trade routes'''
-        self.__axes.clear()
+        #State of a running drag. The dragged planets and their routes are drawn as animated artists
+        #and blitted over a background captured when the drag started
+        self.__dragIndexes = None
+        self.__dragPosition = None
+        self.__dragBackground = None
+        self.__dragMarker = None
+        self.__dragLines: LineCollection = None
+        self.__dragSegments: np.ndarray = None
+        self.__dragStartMoved: np.ndarray = None
+        self.__dragEndMoved: np.ndarray = None
+        self.__dragLastUpdate: float = 0.0
+        #Minimum time between two planetMovingSignals in seconds
+        self.__dragUpdateInterval: float = 0.1
 
-        #Has to be set again here for the planet hover labels to work
-        self.__annotate = self.__axes.annotate("", xy = (0,0), xytext = (10, 10), textcoords = "offset points", bbox = dict(boxstyle="round", fc="w"), arrowprops = dict(arrowstyle="->"))
-        self.__annotate.set_visible(False)
+        #Spatial index over the plotted planets in data coordinates, for hover and pick hit tests.
+        #Rebuilt when planets move or the zoom changes the hit radius, which is also its cell size
+        self.__hitIndex: SpatialIndex = None
+        self.__hitIndexCellSize: float = None
+        self.__hitIndexDrawnOnly: bool = False
+        #Hit radius in data coordinates, computed once per view limits and axes size
+        self.__hitRadiusKey = None
+        self.__hitRadiusData: float = 0.0
+        #Hit tolerance around a planet marker in pixels
+        self.__pickRadius: float = 5.0
 
-        self.__planetNames = []
+        #Time spent handling mouse motion for hovering
+        self.__lastHoverMicroseconds: float = 0.0
+        self.__hoverMicrosecondsTotal: float = 0.0
+        self.__hoverEvents: int = 0
+
+        #Trade routes and auto-connections of the last render, needed to find the routes of a dragged planet
+        self.__plottedTradeRoutes = []
+        self.__plottedAutoConnections = []
+
+        #Everything of the last render. The artists only get the part of it inside the current view,
+        #so pans and zooms re-cull these arrays instead of going back to the planets
+        self.__planetOffsetsAll: np.ndarray = np.empty((0, 2))
+        #Coordinate slots of the plotted planets, see __planetOffsets
+        self.__planetSlots: np.ndarray = None
+        self.__planetSlotsKey = None
+        self.__planetFaceColors: np.ndarray = np.empty((0, 4))
+        self.__planetSelected: np.ndarray = np.empty(0, dtype = bool)
+        self.__routeSegments: np.ndarray = np.empty((0, 2, 2))
+        self.__routeColors: np.ndarray = np.empty((0, 4))
+        self.__routeIsNew: np.ndarray = np.empty(0, dtype = bool)
+        self.__autoSegments: np.ndarray = np.empty((0, 2, 2))
+        #Parts taken out of the static artists, e.g. while they are dragged
+        self.__planetHidden: np.ndarray = np.empty(0, dtype = bool)
+        self.__routeHidden: np.ndarray = np.empty(0, dtype = bool)
+        self.__autoHidden: np.ndarray = np.empty(0, dtype = bool)
+        self.__viewDirty: bool = False
+
+        #Level of detail: with more planets in view than the threshold, unselected planets are drawn
+        #as a density grid of densityBins cells across the view and short routes are left out. Selected
+        #planets are only drawn one by one up to the threshold, more are drawn as a grid of their own. 0 turns it off
+        self.__levelOfDetailThreshold: int = 5000
+        self.__densityBins: int = 64
+        self.__levelOfDetailActive: bool = False
+        #Planets drawn individually by the last render. With level of detail only these can be hit
+        self.__planetDrawn: np.ndarray = np.empty(0, dtype = bool)
+
+        #Spatial index over the last set of auto-connected planets, reused until the set, distance or coordinates change
+        self.__autoConnectionPlanets = []
+        self.__autoConnectionKey = None
+        self.__autoConnectionIndex: SpatialIndex = None
+        self.__autoConnectionPairs = []
+
+        #RGBA colours of the plotted artists
+        self.__tradeRouteColor = np.array([0.0, 0.0, 0.0, 0.4])
+        self.__newTradeRouteColor = np.array([0.0, 0.5, 0.0, 0.8])
+        self.__autoConnectionColor = np.array([0.0, 0.0, 0.0, 0.1])
+        self.__planetColor = np.array([0.0, 0.0, 1.0, 0.1])
+        self.__selectedPlanetColor = np.array([0.0, 0.0, 1.0, 1.0])
+
+        #Line artists live as long as the plot, plotGalaxy only replaces their segments
+        self.__tradeRouteLines: LineCollection = LineCollection(np.empty((0, 2, 2)), zorder = 2)
+        self.__autoConnectionLines: LineCollection = LineCollection(np.empty((0, 2, 2)), colors = [self.__autoConnectionColor], zorder = 1)
+        self.__axes.add_collection(self.__tradeRouteLines, autolim = False)
+        self.__axes.add_collection(self.__autoConnectionLines, autolim = False)
+        self.__densityScatter = self.__axes.scatter(np.empty(0), np.empty(0), marker = 's', edgecolors = 'none', zorder = 0)
+        self.__densityScatter.set_visible(False)
+        self.__selectedDensityScatter = self.__axes.scatter(np.empty(0), np.empty(0), marker = 's', edgecolors = 'none', zorder = 3)
+        self.__selectedDensityScatter.set_visible(False)
+
+        #plotGalaxy only stores its arguments here, the scheduler renders the latest ones once per frame
+        self.__pendingPlot = None
+        self.__redrawScheduler: QtRedrawScheduler = QtRedrawScheduler(self.__renderGalaxy)
+
+        #Connected last, adding the artists above already changes the limits
+        self.__axes.callbacks.connect('xlim_changed', self.__viewChanged)
+        self.__axes.callbacks.connect('ylim_changed', self.__viewChanged)
+
+    def plotGalaxy(self, planets, tradeRoutes, allPlanets, autoPlanetConnectionDistance: int = 0, newTradeRoutes = ()) -> None:
+        '''Plots all planets as alpha = 0.1, then overlays all selected planets and trade routes.
+        The plot is only marked dirty here. Several calls within one frame are rendered once, with the latest arguments'''
+        self.__pendingPlot = (planets, tradeRoutes, allPlanets, autoPlanetConnectionDistance, newTradeRoutes)
+        self.__redrawScheduler.requestRedraw()
+
+    def setFrameBudget(self, frameBudget: int) -> None:
+        '''Sets the minimum time between two renders in milliseconds'''
+        self.__redrawScheduler.frameBudget = frameBudget
+
+    def setLevelOfDetailThreshold(self, threshold: int) -> None:
+        '''Sets how many planets may be in view before they are drawn as a density grid. 0 always draws every planet'''
+        if threshold is not None and threshold >= 0:
+            self.__levelOfDetailThreshold = threshold
+            self.__viewChanged()
+
+    @property
+    def levelOfDetailActive(self) -> bool:
+        '''True if the last render drew the density grid instead of every planet'''
+        return self.__levelOfDetailActive
+
+    @property
+    def planetsDrawn(self) -> int:
+        '''Number of planets the last render drew as single markers'''
+        return int(np.count_nonzero(self.__planetDrawn))
+
+    @property
+    def redrawsRequested(self) -> int:
+        return self.__redrawScheduler.redrawsRequested
+
+    @property
+    def redrawsPerformed(self) -> int:
+        return self.__redrawScheduler.redrawsPerformed
+
+    def __renderGalaxy(self) -> None:
+        '''Renders the latest plotGalaxy arguments. Artists are kept between renders and only their
+        data is updated. The planet scatter is only rebuilt when the set of plotted planets changes,
+        so the current zoom and pan are kept. After a pan or zoom only the culling is redone'''
+        #A render would wipe the blitted drag, it is kept pending until the drag ends
+        if self.__dragIndexes is not None:
+            return
+
+        if self.__pendingPlot is not None:
+            self.__updatePlotData()
+        elif not self.__viewDirty or self.__planetsScatter is None:
+            return
+
+        self.__applyView()
+        self.__galacticPlotCanvas.draw_idle()
+
+    def __updatePlotData(self) -> None:
+        '''Turns the latest plotGalaxy arguments into the arrays the artists are culled from'''
+        planets, tradeRoutes, allPlanets, autoPlanetConnectionDistance, newTradeRoutes = self.__pendingPlot
+        self.__pendingPlot = None
+
+        allPlanets = list(allPlanets)
+        if self.__planetsScatter is None or allPlanets != self.__allPlanets:
+            self.__rebuildPlanetsScatter(allPlanets)
+            self.__hitIndex = None
+
+        #A render that only changes the selection keeps the hit index
+        offsets = self.__planetOffsets(self.__allPlanets)
+        if not np.array_equal(offsets, self.__planetOffsetsAll, equal_nan = True):
+            self.__hitIndex = None
+        self.__planetOffsetsAll = offsets
+
+        self.__planetSelected = self.__selectedPlanetMask(planets)
+        self.__planetFaceColors = np.where(self.__planetSelected[:, np.newaxis], self.__selectedPlanetColor, self.__planetColor)
+        self.__planetHidden = np.zeros(len(allPlanets), dtype = bool)
+
+        #All routes and all auto-connections are drawn as one collection each, coloured per segment
+        tradeRoutes = list(tradeRoutes)
+        self.__plottedTradeRoutes = tradeRoutes
+        self.__routeSegments = self.__segments([(t.start, t.end) for t in tradeRoutes])
+        self.__routeIsNew = self.__newTradeRouteMask(tradeRoutes, newTradeRoutes)
+        self.__routeColors = np.where(self.__routeIsNew[:, np.newaxis], self.__newTradeRouteColor, self.__tradeRouteColor)
+        self.__routeHidden = np.zeros(len(tradeRoutes), dtype = bool)
 
-        x = []
-        y = []
-
-        for p in allPlanets:
-            x.append(p.x)
-            y.append(p.y)
-            self.__planetNames.append(p.name)
-
-        self.__planetsScatter = self.__axes.scatter(x, y, c = 'b', alpha = 0.1, picker = 5)
-
-        x1 = 0        
-        y1 = 0
-        x2 = 0
-        y2 = 0
-
-        # loop through routes
-        for t in tradeRoutes:
-            x1 = t.start.x
-            y1 = t.start.y
-            x2 = t.end.x
-            y2 = t.end.y
-            # plot each route (start, end)            
-            self.__axes.plot([x1, x2], [y1, y2], 'k-', alpha=0.4)
-        
         #Create automatic connections between planets
+        autoConnections = []
         if autoPlanetConnectionDistance > 0:
-            for p1 in planets:
-                for p2 in planets:
-                    if p1 == p2:
-                        break
-                    dist: float = p1.distanceTo(p2)
-                    if dist < autoPlanetConnectionDistance:
-                        self.__axes.plot([p1.x, p2.x], [p1.y, p2.y], 'k-', alpha=0.1)
+            autoConnections = self.getPlanetPairsWithin(planets, autoPlanetConnectionDistance)
+        self.__plottedAutoConnections = autoConnections
+        self.__autoSegments = self.__segments(autoConnections)
+        self.__autoHidden = np.zeros(len(autoConnections), dtype = bool)
 
-        x = []
-        y = []
+    def __viewChanged(self, *args) -> None:
+        '''Handler for pans, zooms and resizes. Schedules culling the artists to the new view'''
+        self.__viewDirty = True
+        self.__redrawScheduler.requestRedraw()
 
-        for p in planets:
-            x.append(p.x)
-            y.append(p.y)
+    def __applyView(self) -> None:
+        '''Gives the artists only the planets and routes intersecting the current view limits.
+        If too many planets are in view, unselected ones are aggregated into a density grid and
+        routes shorter than a grid cell are left out. So are selected ones if they are too many as well'''
+        xmin, xmax = sorted(self.__axes.get_xlim())
+        ymin, ymax = sorted(self.__axes.get_ylim())
+        #Reading the limits may autoscale them first, which reports a view change of its own
+        self.__viewDirty = False
 
-        self.__axes.scatter(x, y, c = 'b')
+        #A margin keeps markers and lines that only partly reach into the view
+        margin = 0.05 * max(xmax - xmin, ymax - ymin)
+        view = (xmin - margin, xmax + margin, ymin - margin, ymax + margin)
 
-        self.__galacticPlotCanvas.draw_idle()
+        offsets = self.__planetOffsetsAll
+        planetsInView = self.__pointsInView(offsets[:, 0], offsets[:, 1], view) & ~self.__planetHidden
+        routesInView = self.__segmentsInView(self.__routeSegments, view) & ~self.__routeHidden
+        autoInView = self.__segmentsInView(self.__autoSegments, view) & ~self.__autoHidden
+
+        self.__levelOfDetailActive = 0 < self.__levelOfDetailThreshold < np.count_nonzero(planetsInView) and xmax > xmin
+        selectionAggregated = False
+        if self.__levelOfDetailActive:
+            cellSize = max(xmax - xmin, ymax - ymin) / self.__densityBins
+            pixelsPerUnit = self.__axes.bbox.width / (xmax - xmin)
+            self.__updateDensity(self.__densityScatter, offsets[planetsInView], xmin, ymin, cellSize, pixelsPerUnit, 1.0, 0.1, 0.7)
+
+            #Too many selected planets are drawn as smaller, opaque squares in the cells holding them
+            planetsInView &= self.__planetSelected
+            selectionAggregated = np.count_nonzero(planetsInView) > self.__levelOfDetailThreshold
+            if selectionAggregated:
+                self.__updateDensity(self.__selectedDensityScatter, offsets[planetsInView], xmin, ymin, cellSize, pixelsPerUnit, 0.5, 0.5, 1.0)
+                planetsInView[:] = False
+
+            #Routes shorter than a cell disappear in it. Unsaved routes are always shown
+            routesInView &= (self.__segmentLengths(self.__routeSegments) >= cellSize) | self.__routeIsNew
+            autoInView &= self.__segmentLengths(self.__autoSegments) >= cellSize
+        self.__densityScatter.set_visible(self.__levelOfDetailActive)
+        self.__selectedDensityScatter.set_visible(selectionAggregated)
+
+        #The hit index covers all planets without level of detail, which survives pans and zooms,
+        #but only the drawn ones with it, so planets aggregated into the density grid cannot be picked
+        if self.__levelOfDetailActive != self.__hitIndexDrawnOnly or \
+                (self.__levelOfDetailActive and not np.array_equal(planetsInView, self.__planetDrawn)):
+            self.__hitIndex = None
+        self.__planetDrawn = planetsInView
+
+        self.__planetsScatter.set_offsets(offsets[planetsInView])
+        self.__planetsScatter.set_facecolors(self.__planetFaceColors[planetsInView])
+        self.__tradeRouteLines.set_segments(self.__routeSegments[routesInView])
+        self.__tradeRouteLines.set_color(self.__routeColors[routesInView])
+        self.__autoConnectionLines.set_segments(self.__autoSegments[autoInView])
+
+    def __updateDensity(self, densityScatter, offsets: np.ndarray, xmin: float, ymin: float, cellSize: float, pixelsPerUnit: float,
+            squareSize: float, minAlpha: float, maxAlpha: float) -> None:
+        '''Draws one square per occupied grid cell, from minAlpha to maxAlpha the more planets it holds.
+        squareSize is the side of the squares as a fraction of a cell'''
+        cells = np.floor((offsets - (xmin, ymin)) / cellSize).astype(np.int64)
+        occupied, counts = np.unique(cells, axis = 0, return_counts = True)
+
+        colors = np.tile(self.__selectedPlanetColor, (len(counts), 1))
+        colors[:, 3] = minAlpha + (maxAlpha - minAlpha) * np.log1p(counts) / np.log1p(counts.max())
+
+        #Marker sizes are areas in points squared
+        squarePoints = squareSize * cellSize * pixelsPerUnit * 72 / self.__galacticPlotCanvas.figure.dpi
+
+        densityScatter.set_offsets((occupied + 0.5) * cellSize + (xmin, ymin))
+        densityScatter.set_facecolors(colors)
+        densityScatter.set_sizes([squarePoints**2])
+
+    def __pointsInView(self, x: np.ndarray, y: np.ndarray, view: tuple) -> np.ndarray:
+        '''Returns which points lie inside view, planets without coordinates never do'''
+        xmin, xmax, ymin, ymax = view
+        return (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+
+    def __segmentsInView(self, segments: np.ndarray, view: tuple) -> np.ndarray:
+        '''Returns which segments have a bounding box overlapping view'''
+        xmin, xmax, ymin, ymax = view
+        x, y = segments[:, :, 0], segments[:, :, 1]
+        return (x.max(axis = 1) >= xmin) & (x.min(axis = 1) <= xmax) & (y.max(axis = 1) >= ymin) & (y.min(axis = 1) <= ymax)
+
+    def __segmentLengths(self, segments: np.ndarray) -> np.ndarray:
+        return np.hypot(segments[:, 1, 0] - segments[:, 0, 0], segments[:, 1, 1] - segments[:, 0, 1])
+
+    def __rebuildPlanetsScatter(self, allPlanets) -> None:
+        '''Replaces the planet scatter after the set of plotted planets changed and rescales the axes to it'''
+        if self.__planetsScatter is not None:
+            self.__planetsScatter.remove()
+
+        self.__allPlanets = allPlanets
+        self.__planetSlotsKey = None
+        self.__planetIndexes = {p: i for i, p in enumerate(allPlanets)}
+        self.__planetNames = [p.name for p in allPlanets]
+
+        #Only the new planets determine the data limits, not the ones that were removed
+        self.__axes.ignore_existing_data_limits = True
+        offsets = self.__planetOffsets(allPlanets)
+        self.__planetsScatter = self.__axes.scatter(offsets[:, 0], offsets[:, 1], c = 'b', edgecolors = 'face', zorder = 3)
+
+    def __planetOffsets(self, planets) -> np.ndarray:
+        '''Returns an (n, 2) array of planet coordinates. Planets sharing a CoordinateStore are
+        gathered from its array by slot, without going through every Planet object'''
+        if len(planets) == 0:
+            return np.empty((0, 2))
 
+        store = planets[0].coordinateStore
+        if store is None:
+            return np.array([(p.x, p.y) for p in planets], dtype = float)
+
+        #Slots stay valid until the store is cleared or another set of planets is plotted
+        key = (store, store.generation, planets is self.__allPlanets)
+        if key != self.__planetSlotsKey:
+            if any(p.coordinateStore is not store for p in planets):
+                return np.array([(p.x, p.y) for p in planets], dtype = float)
+            self.__planetSlots = np.fromiter((p.coordinateSlot for p in planets), dtype = np.intp, count = len(planets))
+            self.__planetSlotsKey = key
+
+        return store.xy(self.__planetSlots)
+
+    def __selectedPlanetMask(self, selectedPlanets) -> np.ndarray:
+        '''Returns which plotted planets are selected, they are drawn opaque'''
+        mask = np.zeros(len(self.__allPlanets), dtype = bool)
+
+        for p in selectedPlanets:
+            index = self.__planetIndexes.get(p)
+            if index is not None:
+                mask[index] = True
+
+        return mask
+
+    def getPlanetPairsWithin(self, planets, distance: float) -> list:
+        '''Returns all pairs of the given planets that are closer than distance to each other'''
+        key = (frozenset(planets), distance)
+        if key != self.__autoConnectionKey:
+            self.__autoConnectionPlanets = list(planets)
+            self.__autoConnectionIndex = SpatialIndex([(p.x, p.y) for p in self.__autoConnectionPlanets], distance)
+            self.__autoConnectionPairs = [(self.__autoConnectionPlanets[i], self.__autoConnectionPlanets[j]) for i, j in self.__autoConnectionIndex.pairsWithin(distance)]
+            self.__autoConnectionKey = key
+
+        return self.__autoConnectionPairs
+
+    def __segments(self, planetPairs) -> np.ndarray:
+        '''Returns an (n, 2, 2) array of line segments between pairs of planets'''
+        if len(planetPairs) == 0:
+            return np.empty((0, 2, 2))
+
+        return np.array([((p1.x, p1.y), (p2.x, p2.y)) for p1, p2 in planetPairs], dtype = float)
+
+    def __newTradeRouteMask(self, tradeRoutes, newTradeRoutes) -> np.ndarray:
+        '''Returns which trade routes have not been saved yet, they are highlighted'''
+        newTradeRoutes = set(newTradeRoutes)
+        return np.array([t in newTradeRoutes for t in tradeRoutes], dtype = bool)
+
+    def invalidateSpatialIndex(self) -> None:
+        '''Forces the spatial index to be rebuilt, e.g. after planet coordinates changed'''
+        self.__autoConnectionKey = None
+        self.__hitIndex = None
+
+    @property
+    def lastHoverMicroseconds(self) -> float:
+        '''Time the last mouse motion took to hit test and annotate, in microseconds'''
+        return self.__lastHoverMicroseconds
+
+    @property
+    def meanHoverMicroseconds(self) -> float:
+        '''Mean time of all mouse motions so far to hit test and annotate, in microseconds'''
+        if self.__hoverEvents == 0:
+            return 0.0
+        return self.__hoverMicrosecondsTotal / self.__hoverEvents
 
     def getWidget(self) -> QWidget:
         '''Returns the plot widget'''
@@ -95,12 +410,65 @@ class QtGalacticPlot(QWidget):
 
     def __planetSelect(self, event) -> None:
         '''Event handler for selecting a planet on the map'''
-        self.picked_planet_index = event.ind
-        self.pick_pos = (event.mouseevent.xdata, event.mouseevent.ydata)
+        indexes = self.__planetsAt(event)
+        if len(indexes) > 0:
+            self.picked_planet_index = indexes
+            self.pick_pos = (event.xdata, event.ydata)
+
+    def __planetsAt(self, event) -> list:
+        '''Returns the indexes of all plotted planets under the mouse'''
+        if event.inaxes != self.__axes or event.xdata is None or self.__planetsScatter is None:
+            return []
+
+        radius = self.__hitRadius()
+        if radius <= 0:
+            return []
+
+        if self.__hitIndex is None or not math.isclose(self.__hitIndexCellSize, radius, rel_tol = 1e-6):
+            hittable = ~np.isnan(self.__planetOffsetsAll).any(axis = 1)
+            if self.__levelOfDetailActive:
+                hittable &= self.__planetDrawn
+            points = [(x, y) if hit else (None, None) for (x, y), hit in zip(self.__planetOffsetsAll.tolist(), hittable.tolist())]
+            self.__hitIndex = SpatialIndex(points, radius)
+            self.__hitIndexCellSize = radius
+            self.__hitIndexDrawnOnly = self.__levelOfDetailActive
+
+        return sorted(self.__hitIndex.queryRadius(event.xdata, event.ydata, radius))
+
+    def __hitRadius(self) -> float:
+        '''Returns the hit tolerance of a planet marker converted to data coordinates at the current zoom.
+        It only depends on the scale of the view, so it is computed once per view limits and axes size'''
+        sizes = self.__planetsScatter.get_sizes()
+        markerSize = float(sizes[0]) if len(sizes) > 0 else 0.0
+        dpi = self.__galacticPlotCanvas.figure.dpi
+        key = (self.__axes.get_xlim(), self.__axes.get_ylim(), self.__axes.bbox.bounds, markerSize, dpi)
+        if key == self.__hitRadiusKey:
+            return self.__hitRadiusData
+
+        #Marker sizes are areas in points squared
+        pixels = self.__pickRadius + math.sqrt(markerSize) / 2 * dpi / 72
+
+        #The axes are linear, so the scale of the transform is the same everywhere
+        matrix = self.__axes.transData.get_affine().get_matrix()
+        scaleX, scaleY = abs(matrix[0, 0]), abs(matrix[1, 1])
+        radius = float(max(pixels / scaleX, pixels / scaleY)) if scaleX > 0 and scaleY > 0 else 0.0
+
+        self.__hitRadiusKey = key
+        self.__hitRadiusData = radius
+        return radius
     
     def __buttonReleased(self, event):
         '''Emit signal to select a planet or move it'''
-        if self.picked_planet_index is not None:
+        if self.__dragIndexes is not None:
+            #Released outside the axes, the planets stay where they were last drawn
+            indexes, position = self.__dragIndexes, self.__dragPosition
+            if event.inaxes == self.__axes and event.xdata is not None:
+                position = (event.xdata, event.ydata)
+            self.__endDrag()
+            self.planetDraggedSignal.emit(list(indexes), position)
+            self.picked_planet_index = None
+            self.pick_pos = None
+        elif self.picked_planet_index is not None:
             new_pos = (event.xdata, event.ydata)
             if self.pick_pos[0] == new_pos[0] and self.pick_pos[1] == new_pos[1]:
                 self.planetSelectedSignal.emit(list(self.picked_planet_index))
@@ -111,23 +479,139 @@ class QtGalacticPlot(QWidget):
 
     def __planetHover(self, event) -> None:
         '''Handler for hovering on a planet in the plot'''
-        visible = self.__annotate.get_visible()
+        if self.__dragIndexes is not None:
+            return
 
-        if event.inaxes == self.__axes:
-            contains, ind = self.__planetsScatter.contains(event)
+        start = time.perf_counter_ns()
+        indexes = self.__planetsAt(event)
 
-            if contains:
-                self.__update_annotation(ind)
+        #Only blit when the hovered planets change
+        if indexes != self.__annotatedIndexes:
+            self.__annotatedIndexes = indexes
+            if len(indexes) > 0:
+                self.__update_annotation(indexes)
                 self.__annotate.set_visible(True)
-                self.__galacticPlotCanvas.draw_idle()
             else:
-                if visible:
-                    self.__annotate.set_visible(False)
-                    self.__galacticPlotCanvas.draw_idle()
+                self.__annotate.set_visible(False)
+            self.__blitAnnotation()
 
-    def __update_annotation(self, ind) -> None:
+        self.__lastHoverMicroseconds = (time.perf_counter_ns() - start) / 1000.0
+        self.__hoverMicrosecondsTotal += self.__lastHoverMicroseconds
+        self.__hoverEvents += 1
+
+    def __update_annotation(self, indexes: list) -> None:
         '''Updates annotation parameters'''
-        pos = self.__planetsScatter.get_offsets()[ind["ind"][0]]
+        pos = self.__planetOffsetsAll[indexes[0]]
         self.__annotate.xy = pos
-        text = "{}".format(" ".join([self.__planetNames[n] for n in ind["ind"]]))
-        self.__annotate.set_text(text)
\ No newline at end of file
+        text = "{}".format(" ".join([self.__planetNames[n] for n in indexes]))
+        self.__annotate.set_text(text)
+
+    def __canvasDrawn(self, event) -> None:
+        '''Keeps the result of every full draw as background for the annotation and draws it on top'''
+        self.__annotationBackground = self.__galacticPlotCanvas.copy_from_bbox(self.__galacticPlotCanvas.figure.bbox)
+        if self.__annotate.get_visible():
+            self.__galacticPlotCanvas.figure.draw_artist(self.__annotate)
+
+    def __blitAnnotation(self) -> None:
+        '''Redraws only the annotation over the background of the last full draw'''
+        if self.__annotationBackground is None:
+            self.__galacticPlotCanvas.draw_idle()
+            return
+
+        self.__galacticPlotCanvas.restore_region(self.__annotationBackground)
+        if self.__annotate.get_visible():
+            self.__galacticPlotCanvas.figure.draw_artist(self.__annotate)
+        self.__galacticPlotCanvas.blit(self.__galacticPlotCanvas.figure.bbox)
+
+    def __planetMoved(self, event) -> None:
+        '''Handler for moving the mouse with a picked planet, starts or continues a drag'''
+        if self.picked_planet_index is None or event.button is None:
+            return
+
+        if event.inaxes != self.__axes or event.xdata is None:
+            return
+
+        position = (event.xdata, event.ydata)
+        if self.__dragIndexes is None:
+            if position == self.pick_pos:
+                return
+            self.__startDrag(list(self.picked_planet_index))
+
+        self.__blitDrag(position)
+
+        now = time.perf_counter()
+        if now - self.__dragLastUpdate >= self.__dragUpdateInterval:
+            self.__dragLastUpdate = now
+            self.planetMovingSignal.emit(list(self.__dragIndexes), position)
+
+    def __startDrag(self, indexes: list) -> None:
+        '''Takes the dragged planets and their routes out of the static artists, draws the rest once
+        and keeps it as the background the animated drag artists are blitted over'''
+        self.__dragIndexes = indexes
+        self.__dragLastUpdate = time.perf_counter()
+        draggedPlanets = {self.__allPlanets[i] for i in indexes}
+
+        routePairs = [(t.start, t.end) for t in self.__plottedTradeRoutes]
+        autoPairs = self.__plottedAutoConnections
+        routeMask = np.array([p1 in draggedPlanets or p2 in draggedPlanets for p1, p2 in routePairs], dtype = bool)
+        autoMask = np.array([p1 in draggedPlanets or p2 in draggedPlanets for p1, p2 in autoPairs], dtype = bool)
+
+        #Only the segments touching a dragged planet follow the mouse, all others stay in the background
+        incidentPairs = [pair for pair, incident in zip(routePairs, routeMask) if incident]
+        incidentPairs += [pair for pair, incident in zip(autoPairs, autoMask) if incident]
+        self.__dragSegments = np.concatenate((self.__routeSegments[routeMask], self.__autoSegments[autoMask]))
+        self.__dragStartMoved = np.array([p1 in draggedPlanets for p1, p2 in incidentPairs], dtype = bool)
+        self.__dragEndMoved = np.array([p2 in draggedPlanets for p1, p2 in incidentPairs], dtype = bool)
+        dragColors = np.concatenate((self.__routeColors[routeMask], np.tile(self.__autoConnectionColor, (int(autoMask.sum()), 1))))
+
+        self.__routeHidden = routeMask
+        self.__autoHidden = autoMask
+        self.__planetHidden[indexes] = True
+        self.__applyView()
+        self.__annotate.set_visible(False)
+        self.__annotatedIndexes = []
+
+        self.__dragLines = LineCollection(self.__dragSegments, colors = dragColors, zorder = 2, animated = True)
+        self.__axes.add_collection(self.__dragLines, autolim = False)
+        self.__dragMarker = self.__axes.plot([], [], 'o', color = self.__selectedPlanetColor, zorder = 3, animated = True)[0]
+
+        self.__galacticPlotCanvas.draw()
+        self.__dragBackground = self.__galacticPlotCanvas.copy_from_bbox(self.__axes.bbox)
+
+    def __blitDrag(self, position: tuple) -> None:
+        '''Redraws only the dragged planets and their routes at position'''
+        self.__dragPosition = position
+        segments = self.__dragSegments.copy()
+        segments[self.__dragStartMoved, 0] = position
+        segments[self.__dragEndMoved, 1] = position
+        self.__dragLines.set_segments(segments)
+        self.__dragMarker.set_data([position[0]], [position[1]])
+
+        self.__galacticPlotCanvas.restore_region(self.__dragBackground)
+        self.__axes.draw_artist(self.__dragLines)
+        self.__axes.draw_artist(self.__dragMarker)
+        self.__galacticPlotCanvas.blit(self.__axes.bbox)
+
+    def __endDrag(self) -> None:
+        '''Removes the drag artists and puts the static artists back the way they were'''
+        self.__dragLines.remove()
+        self.__dragMarker.remove()
+
+        self.__planetHidden[:] = False
+        self.__routeHidden[:] = False
+        self.__autoHidden[:] = False
+        self.__applyView()
+
+        self.__dragIndexes = None
+        self.__dragPosition = None
+        self.__dragBackground = None
+        self.__dragMarker = None
+        self.__dragLines = None
+        self.__dragSegments = None
+        self.__dragStartMoved = None
+        self.__dragEndMoved = None
+
+        if self.__pendingPlot is not None:
+            self.__redrawScheduler.requestRedraw()
+        else:
+            self.__galacticPlotCanvas.draw_idle()
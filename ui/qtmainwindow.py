@@ -1,10 +1,14 @@
-from typing import List
+from typing import Callable, List
 
 from PyQt5 import QtCore
-from PyQt5.QtWidgets import QAction, QPushButton, QCheckBox, QComboBox, QFileDialog, QHeaderView, QLabel, QMainWindow, QMenu, QMenuBar, QDialog, QSplitter, \
-    QTableWidget, QTableWidgetItem, QTabWidget, QVBoxLayout, QWidget
+from PyQt5.QtCore import QThreadPool
+from PyQt5.QtWidgets import QAction, QPushButton, QCheckBox, QComboBox, QFileDialog, QHeaderView, QLabel, QMainWindow, QMenu, QMenuBar, QMessageBox, QDialog, QSplitter, \
+    QProgressDialog, QTableView, QTabWidget, QVBoxLayout, QWidget
 
 from ui.galacticplot import GalacticPlot
+from ui.qtbackgroundtask import QtBackgroundTask
+from ui.qtchecklistmodel import QtCheckListModel
+from ui.qtfilewatcher import QtFileWatcher
 from ui.mainwindow_presenter import MainWindow, MainWindowPresenter
 from ui.qtgalacticplot import QtGalacticPlot
 from ui.qttablewidgetfactory import QtTableWidgetFactory
@@ -18,6 +22,10 @@ class QtMainWindow(MainWindow):
     def __init__(self):
         self.__allPlanetsChecked: bool = False
         self.__allTradeRoutesChecked: bool = False
+        #Tasks running in the background are kept alive here until they finish
+        self.__backgroundTasks: set = set()
+        #Only created once files are watched
+        self.__fileWatcher: QtFileWatcher = None
 
         #Main window setup
         self.__window: QMainWindow = QMainWindow()
@@ -33,25 +41,27 @@ class QtMainWindow(MainWindow):
 
         self.__tableWidgetFactory = QtTableWidgetFactory()
 
-        self.__planetListWidget = self.__tableWidgetFactory.construct(["Planets"])
-        self.__planetListWidget.itemClicked.connect(self.__onPlanetTableWidgetItemClicked)
+        self.__planetListModel: QtCheckListModel = QtCheckListModel("Planets")
+        self.__planetListModel.checkStateToggled.connect(self.__onPlanetCheckStateToggled)
+        self.__planetListWidget: QTableView = self.__tableWidgetFactory.constructView(self.__planetListModel)
         self.__planetListWidget.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.__planetListWidget.customContextMenuRequested.connect(self.__showPlanetContextMenu)
 
-        self.__tradeRouteListWidget = self.__tableWidgetFactory.construct(["Trade Routes"])
-        self.__tradeRouteListWidget.itemClicked.connect(self.__onTradeRouteTableWidgetItemClicked)
+        self.__tradeRouteListModel: QtCheckListModel = QtCheckListModel("Trade Routes")
+        self.__tradeRouteListModel.checkStateToggled.connect(self.__onTradeRouteCheckStateToggled)
+        self.__tradeRouteListWidget: QTableView = self.__tableWidgetFactory.constructView(self.__tradeRouteListModel)
 
         self.__selectAllPlanetsButton: QPushButton = QPushButton("Select All Planets")
-        self.__selectAllPlanetsButton.clicked.connect(lambda: self.__selectAllPlanetsButtonClicked(self.__planetListWidget, True))
+        self.__selectAllPlanetsButton.clicked.connect(lambda: self.__selectAllPlanetsButtonClicked(self.__planetListModel, True))
 
         self.__deselectAllPlanetsButton: QPushButton = QPushButton("Deselect All Planets")
-        self.__deselectAllPlanetsButton.clicked.connect(lambda: self.__selectAllPlanetsButtonClicked(self.__planetListWidget, False))
+        self.__deselectAllPlanetsButton.clicked.connect(lambda: self.__selectAllPlanetsButtonClicked(self.__planetListModel, False))
 
         self.__selectAllTradeRoutesButton: QPushButton = QPushButton("Select All Trade Routes")
-        self.__selectAllTradeRoutesButton.clicked.connect(lambda: self.__selectAllTradeRoutesButtonClicked(self.__tradeRouteListWidget, True))
+        self.__selectAllTradeRoutesButton.clicked.connect(lambda: self.__selectAllTradeRoutesButtonClicked(self.__tradeRouteListModel, True))
 
         self.__deselectAllTradeRoutesButton: QPushButton = QPushButton("Deselect All Trade Routes")
-        self.__deselectAllTradeRoutesButton.clicked.connect(lambda: self.__selectAllTradeRoutesButtonClicked(self.__tradeRouteListWidget, False))
+        self.__deselectAllTradeRoutesButton.clicked.connect(lambda: self.__selectAllTradeRoutesButtonClicked(self.__tradeRouteListModel, False))
 
         #Left pane, Forces tab
         self.__planetComboBox: QComboBox = QComboBox()
@@ -136,17 +146,23 @@ class QtMainWindow(MainWindow):
 
     def addPlanets(self, planets: List[str]) -> None:
         '''Add Planet objects to the planet table widget'''
-        self.__addEntriesToTableWidget(self.__planetListWidget, planets)
+        self.__planetListModel.appendEntries(planets)
 
     def addTradeRoutes(self, tradeRoutes: List[str]) -> None:
         '''Add TradeRoute objects to the trade route table widget'''
-        self.__addEntriesToTableWidget(self.__tradeRouteListWidget, tradeRoutes)
+        self.__tradeRouteListModel.appendEntries(tradeRoutes)
 
     def updateTradeRoutes(self, tradeRoutes: List[str]) -> None:
         '''Update TradeRoute trade route table widget'''
-        self.__tradeRouteListWidget.clearContents()
-        self.__tradeRouteListWidget.setRowCount(0)
-        self.__addEntriesToTableWidget(self.__tradeRouteListWidget, tradeRoutes)
+        self.__tradeRouteListModel.setEntries(tradeRoutes)
+
+    def insertPlanet(self, row: int, planet: str, checked: bool) -> None:
+        '''Insert a single planet into the planet table widget'''
+        self.__planetListModel.insertEntry(row, planet, checked)
+
+    def insertTradeRoute(self, row: int, tradeRoute: str, checked: bool) -> None:
+        '''Insert a single trade route into the trade route table widget'''
+        self.__tradeRouteListModel.insertEntry(row, tradeRoute, checked)
 
     def addCampaigns(self, campaigns: List[str]) -> None:
         '''Add Campaign objects to the campaign combobox widget'''
@@ -158,16 +174,54 @@ class QtMainWindow(MainWindow):
         self.__widget.addWidget(plot.getWidget())
         return plot
 
+    def runInBackground(self, title: str, task: Callable, onFinished: Callable, onFailed: Callable) -> None:
+        '''Runs task(progress, isCancelled) on a thread pool thread, showing its progress in a dialog that can cancel it.
+        onFinished(result) or onFailed(message) are called on the GUI thread afterwards'''
+        backgroundTask = QtBackgroundTask(task)
+        self.__backgroundTasks.add(backgroundTask)
+
+        dialog = QProgressDialog(title, "Cancel", 0, 0, self.__window)
+        dialog.setWindowTitle(title)
+        dialog.setMinimumDuration(500)
+        dialog.canceled.connect(backgroundTask.cancel)
+
+        def showProgress(done: int, total: int, text: str) -> None:
+            dialog.setMaximum(total)
+            dialog.setValue(done)
+            dialog.setLabelText(title + "\n" + text)
+
+        def finish(callback: Callable, argument) -> None:
+            self.__backgroundTasks.discard(backgroundTask)
+            dialog.canceled.disconnect(backgroundTask.cancel)
+            dialog.reset()
+            dialog.deleteLater()
+            callback(argument)
+
+        backgroundTask.signals.progress.connect(showProgress)
+        backgroundTask.signals.finished.connect(lambda result: finish(onFinished, result))
+        backgroundTask.signals.failed.connect(lambda message: finish(onFailed, message))
+
+        QThreadPool.globalInstance().start(backgroundTask)
+
+    def watchFiles(self, paths: List[str], onChanged: Callable) -> None:
+        '''Calls onChanged(paths) on the GUI thread when watched files change, once per burst of changes'''
+        if self.__fileWatcher is None:
+            self.__fileWatcher = QtFileWatcher()
+
+        self.__fileWatcher.watch(paths, onChanged)
+
+    def showError(self, title: str, message: str) -> None:
+        '''Shows an error message box over the window'''
+        QMessageBox.critical(self.__window, title, message)
+
     def getWindow(self) -> QMainWindow:
         '''Returns the window'''
         return self.__window
 
     def emptyWidgets(self) -> None:
         '''Clears all list and combobox widgets'''
-        self.__planetListWidget.clearContents()
-        self.__planetListWidget.setRowCount(0)
-        self.__tradeRouteListWidget.clearContents()
-        self.__tradeRouteListWidget.setRowCount(0)
+        self.__planetListModel.setEntries([])
+        self.__tradeRouteListModel.setEntries([])
         self.__campaignComboBox.clear()
         
         self.__planetComboBox.clear()
@@ -197,43 +251,23 @@ class QtMainWindow(MainWindow):
     
     def updatePlanetSelection(self, planets: List[int]) -> None:
         '''Clears table, then checks off planets in the table from a list of indexes'''
-        self.__uncheckAllTable(self.__planetListWidget)
-
-        for p in planets:
-            self.__planetListWidget.item(p, 0).setCheckState(QtCore.Qt.Checked)
+        self.__planetListModel.setCheckedRows(planets)
     
     def updateTradeRouteSelection(self, tradeRoutes: List[int]) -> None:
         '''Clears table, then checks off trade routes in the table from a list of indexes'''
-        self.__uncheckAllTable(self.__tradeRouteListWidget)
-
-        for t in tradeRoutes:
-            self.__tradeRouteListWidget.item(t, 0).setCheckState(QtCore.Qt.Checked)
+        self.__tradeRouteListModel.setCheckedRows(tradeRoutes)
 
     def clearPlanets(self) -> None:
         '''Helper function to clear planet selections from the presenter'''
-        self.__uncheckAllTable(self.__planetListWidget)
+        self.__planetListModel.setAllChecked(False)
     
     def clearTradeRoutes(self) -> None:
         '''Helper function to clear traderoute selections from the presenter'''
-        self.__uncheckAllTable(self.__tradeRouteListWidget)
-
-    def __addEntriesToTableWidget(self, widget: QTableWidget, entries: List[str]) -> None:
-        '''Adds a list of rows to a table widget'''
-        for entry in entries:
-            rowCount = widget.rowCount()
-            widget.setRowCount(rowCount + 1)
-            item: QTableWidgetItem = QTableWidgetItem(entry)
-            item.setFlags(QtCore.Qt.ItemIsUserCheckable | QtCore.Qt.ItemIsEnabled)
-            item.setCheckState(QtCore.Qt.Unchecked)
-            widget.setItem(rowCount, 0, item)
-
-    def __onPlanetTableWidgetItemClicked(self, item: QTableWidgetItem) -> None:
-        '''If a planet table widget item is clicked, check it and call the presenter to display it'''
-        checked: bool = False
-        if item.checkState() == QtCore.Qt.Checked:
-            checked = True
-
-        self.__presenter.onPlanetChecked(item.row(), checked)
+        self.__tradeRouteListModel.setAllChecked(False)
+
+    def __onPlanetCheckStateToggled(self, row: int, checked: bool) -> None:
+        '''If a planet check box is toggled, call the presenter to display it'''
+        self.__presenter.onPlanetChecked(row, checked)
         
     def __showHidePlanetsFromFilesSettings(self):
         self.__presenter.showPlanetFileHiderCommand.execute()
@@ -242,15 +276,13 @@ class QtMainWindow(MainWindow):
         self.__presenter.autoConnectionSettingsCommand.execute()
 
     def __showPlanetContextMenu(self, position) -> None:
-        self.__presenter.planetContextMenu.show(self.__planetListWidget.itemAt(position), self.__planetListWidget.mapToGlobal(position))
+        index = self.__planetListWidget.indexAt(position)
+        if index.isValid():
+            self.__presenter.planetContextMenu.show(index, self.__planetListWidget.mapToGlobal(position))
 
-    def __onTradeRouteTableWidgetItemClicked(self, item: QTableWidgetItem) -> None:
-        '''If a trade route table widget item is clicked, check it and call the presenter to display it'''
-        checked: bool = False
-        if item.checkState() == QtCore.Qt.Checked:
-            checked = True
-
-        self.__presenter.onTradeRouteChecked(item.row(), checked)
+    def __onTradeRouteCheckStateToggled(self, row: int, checked: bool) -> None:
+        '''If a trade route check box is toggled, call the presenter to display it'''
+        self.__presenter.onTradeRouteChecked(row, checked)
 
     def __newCampaign(self) -> None:
         '''Helper function to launch the new campaign dialog'''
@@ -284,28 +316,32 @@ class QtMainWindow(MainWindow):
         '''Exits application by closing the window'''
         self.__window.close()
 
-    def __selectAllPlanetsButtonClicked(self, table: QTableWidget, checked: bool) -> None:
-        '''Cycles through a table and checks all the planet entries, then presents them'''
+    def __selectAllPlanetsButtonClicked(self, model: QtCheckListModel, checked: bool) -> None:
+        '''Checks or unchecks all the planet entries at once, then presents them'''
+        self.__presenter.beginBatchUpdate()
+
         if checked:
-            self.__checkAllTable(table)
+            model.setAllChecked(True)
             
             self.__presenter.allPlanetsChecked(True)
         
         else:
-            self.__uncheckAllTable(table)
+            model.setAllChecked(False)
             
             self.__presenter.allPlanetsChecked(False)
+
+        self.__presenter.endBatchUpdate()
         
     
-    def __selectAllTradeRoutesButtonClicked(self, table: QTableWidget, checked: bool) -> None:
-        '''Cycles through a table and checks all the trade route entries, then presents them'''        
+    def __selectAllTradeRoutesButtonClicked(self, model: QtCheckListModel, checked: bool) -> None:
+        '''Checks or unchecks all the trade route entries at once, then presents them'''        
         if checked:
-            self.__checkAllTable(table)
+            model.setAllChecked(True)
             
             self.__presenter.allTradeRoutesChecked(True)
         
         else:
-            self.__uncheckAllTable(table)
+            model.setAllChecked(False)
             
             self.__presenter.allTradeRoutesChecked(False)
 
@@ -313,18 +349,6 @@ class QtMainWindow(MainWindow):
         '''Presents a selected campaign'''
         self.__presenter.onCampaignSelected(index)
 
-    def __checkAllTable(self, table: QTableWidget) -> None:
-        '''Checks all rows in a table widget'''
-        rowCount = table.rowCount()
-        for row in range(rowCount):
-            table.item(row, 0).setCheckState(QtCore.Qt.Checked)
-
-    def __uncheckAllTable(self, table: QTableWidget) -> None:
-        '''Unchecks all rows in a table widget'''
-        rowCount = table.rowCount()
-        for row in range(rowCount):
-            table.item(row, 0).setCheckState(QtCore.Qt.Unchecked)
-
     def __campaignPropertiesButtonClicked(self) -> None:
         '''Helper function to launch the campaign properties dialog'''
         if self.__presenter is not None:
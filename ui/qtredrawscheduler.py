@@ -0,0 +1,60 @@
+import time
+from typing import Callable
+
+from PyQt5.QtCore import QObject, QTimer
+
+
+class QtRedrawScheduler(QObject):
+    '''Coalesces redraw requests. Requests only mark the target dirty, and the render callback runs
+        at most once per frame budget, on a later turn of the Qt event loop'''
+    def __init__(self, render: Callable[[], None], frameBudget: int = 16):
+        super(QtRedrawScheduler, self).__init__()
+        self.__render: Callable[[], None] = render
+        self.__frameBudget: int = frameBudget
+        self.__lastRenderTime: float = 0.0
+
+        self.__timer: QTimer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.timeout.connect(self.__renderNow)
+
+        #Counters to verify the coalescing: every requestRedraw call versus every render that actually ran
+        self.__redrawsRequested: int = 0
+        self.__redrawsPerformed: int = 0
+
+    def requestRedraw(self) -> None:
+        '''Marks the target dirty. Renders once the current frame budget has elapsed'''
+        self.__redrawsRequested += 1
+        if self.__timer.isActive():
+            return
+
+        elapsed = (time.perf_counter() - self.__lastRenderTime) * 1000.0
+        self.__timer.start(max(0, int(self.__frameBudget - elapsed)))
+
+    def flush(self) -> None:
+        '''Renders immediately if a redraw is pending'''
+        if self.__timer.isActive():
+            self.__timer.stop()
+            self.__renderNow()
+
+    def __renderNow(self) -> None:
+        self.__lastRenderTime = time.perf_counter()
+        self.__redrawsPerformed += 1
+        self.__render()
+
+    @property
+    def frameBudget(self) -> int:
+        '''Minimum time between two renders in milliseconds'''
+        return self.__frameBudget
+
+    @frameBudget.setter
+    def frameBudget(self, value: int) -> None:
+        if value is not None and value >= 0:
+            self.__frameBudget = value
+
+    @property
+    def redrawsRequested(self) -> int:
+        return self.__redrawsRequested
+
+    @property
+    def redrawsPerformed(self) -> int:
+        return self.__redrawsPerformed
@@ -1,4 +1,5 @@
-from PyQt5.QtWidgets import QHeaderView, QTableWidget
+from PyQt5.QtCore import QAbstractItemModel
+from PyQt5.QtWidgets import QHeaderView, QTableView, QTableWidget
 
 class QtTableWidgetFactory():
     '''Factory for table widgets'''
@@ -14,4 +15,14 @@ class QtTableWidgetFactory():
         tableWidget.verticalHeader().setVisible(False)
         return tableWidget
 
+    def constructView(self, model: QAbstractItemModel) -> QTableView:
+        '''Constructs a table view over a model. Only the visible rows are ever queried'''
+        tableView: QTableView = QTableView()
+        tableView.setModel(model)
+        tableView.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        tableView.verticalHeader().setVisible(False)
+        #Uniform row heights let the view skip measuring every row
+        tableView.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        return tableView
+
     
\ No newline at end of file
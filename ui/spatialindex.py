@@ -0,0 +1,81 @@
+from math import floor
+from typing import Dict, List, Tuple
+
+
+class SpatialIndex:
+    '''Uniform grid over a list of 2D points for radius queries.
+        Points are referred to by their index in the list the grid was built from'''
+    def __init__(self, points: List[Tuple[float, float]], cellSize: float):
+        self.__points: List[Tuple[float, float]] = points
+        self.__cellSize: float = float(cellSize)
+        self.__cells: Dict[Tuple[int, int], List[int]] = dict()
+
+        for index, (x, y) in enumerate(points):
+            #Planets without resolved coordinates cannot be placed
+            if x is None or y is None:
+                continue
+            self.__cells.setdefault(self.__cellOf(x, y), []).append(index)
+
+    def queryRadius(self, x: float, y: float, radius: float) -> List[int]:
+        '''Returns the indexes of all points closer than radius to (x, y)'''
+        result = []
+        radiusSquared = radius * radius
+
+        for index in self.__candidates(x, y, radius):
+            px, py = self.__points[index]
+            if (px - x)**2 + (py - y)**2 < radiusSquared:
+                result.append(index)
+
+        return result
+
+    def nearest(self, x: float, y: float, radius: float) -> int:
+        '''Returns the index of the point closest to (x, y) within radius, or None'''
+        nearestIndex = None
+        nearestDistance = radius * radius
+
+        for index in self.__candidates(x, y, radius):
+            px, py = self.__points[index]
+            distance = (px - x)**2 + (py - y)**2
+            if distance < nearestDistance:
+                nearestIndex = index
+                nearestDistance = distance
+
+        return nearestIndex
+
+    def pairsWithin(self, radius: float) -> List[Tuple[int, int]]:
+        '''Returns every unordered pair (i, j), i < j, of points closer than radius to each other'''
+        pairs = []
+        radiusSquared = radius * radius
+
+        for cellIndexes in self.__cells.values():
+            for i in cellIndexes:
+                x, y = self.__points[i]
+                for j in self.__candidates(x, y, radius):
+                    if j <= i:
+                        continue
+                    px, py = self.__points[j]
+                    if (px - x)**2 + (py - y)**2 < radiusSquared:
+                        pairs.append((i, j))
+
+        return pairs
+
+    def __candidates(self, x: float, y: float, radius: float):
+        '''Yields the indexes of all points in grid cells overlapping the square around (x, y)'''
+        minCellX, minCellY = self.__cellOf(x - radius, y - radius)
+        maxCellX, maxCellY = self.__cellOf(x + radius, y + radius)
+
+        #For large radii it is cheaper to filter the occupied cells than to visit every cell in range
+        if (maxCellX - minCellX + 1) * (maxCellY - minCellY + 1) > len(self.__cells):
+            for (cellX, cellY), cellIndexes in self.__cells.items():
+                if minCellX <= cellX <= maxCellX and minCellY <= cellY <= maxCellY:
+                    yield from cellIndexes
+            return
+
+        for cellX in range(minCellX, maxCellX + 1):
+            for cellY in range(minCellY, maxCellY + 1):
+                cellIndexes = self.__cells.get((cellX, cellY))
+                if cellIndexes is not None:
+                    yield from cellIndexes
+
+    def __cellOf(self, x: float, y: float) -> Tuple[int, int]:
+        return floor(x / self.__cellSize), floor(y / self.__cellSize)
@@ -0,0 +1,84 @@
+import contextlib
+import json
+import threading
+import time
+from typing import Dict, List
+
+
+class LoadProfiler:
+    '''Collects wall and CPU time per load phase and counters such as files parsed or bytes read.
+        Counts go to the innermost running phase and to the totals. A disabled profiler does nothing,
+        its phase and count calls return right away'''
+    def __init__(self, enabled: bool = True):
+        self.__enabled: bool = enabled
+        self.__lock: threading.Lock = threading.Lock()
+        self.__phases: Dict[str, dict] = {}
+        self.__totals: Dict[str, int] = {}
+        self.__runningPhases: List[str] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    def reset(self) -> None:
+        '''Forgets everything measured so far'''
+        with self.__lock:
+            self.__phases = {}
+            self.__totals = {}
+            self.__runningPhases = []
+
+    def phase(self, name: str):
+        '''Returns a context manager that times the code it encloses as the named phase.
+        A phase that runs several times is summed up'''
+        if not self.__enabled:
+            return contextlib.nullcontext()
+
+        return self.__timePhase(name)
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        '''Adds amount to a counter. Safe to call from the threads parsing files'''
+        if not self.__enabled:
+            return
+
+        with self.__lock:
+            self.__totals[counter] = self.__totals.get(counter, 0) + amount
+            if len(self.__runningPhases) > 0:
+                counters = self.__phases[self.__runningPhases[-1]]["counters"]
+                counters[counter] = counters.get(counter, 0) + amount
+
+    def report(self) -> dict:
+        '''Returns the phases in the order they first ran, with their times, runs and counters, and the counter totals'''
+        with self.__lock:
+            phases = {}
+            for name, phase in self.__phases.items():
+                phases[name] = {
+                    "wallSeconds": round(phase["wallSeconds"], 6),
+                    "cpuSeconds": round(phase["cpuSeconds"], 6),
+                    "runs": phase["runs"],
+                    "counters": dict(phase["counters"])
+                }
+
+            return {"phases": phases, "counters": dict(self.__totals)}
+
+    def reportJSON(self) -> str:
+        return json.dumps(self.report(), indent = 4)
+
+    @contextlib.contextmanager
+    def __timePhase(self, name: str):
+        with self.__lock:
+            phase = self.__phases.setdefault(name, {"wallSeconds": 0.0, "cpuSeconds": 0.0, "runs": 0, "counters": {}})
+            self.__runningPhases.append(name)
+
+        wallStart = time.perf_counter()
+        cpuStart = time.process_time()
+        try:
+            yield
+        finally:
+            wallTime = time.perf_counter() - wallStart
+            cpuTime = time.process_time() - cpuStart
+
+            with self.__lock:
+                phase["wallSeconds"] += wallTime
+                phase["cpuSeconds"] += cpuTime
+                phase["runs"] += 1
+                self.__runningPhases.pop()
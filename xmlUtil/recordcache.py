@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import tempfile
+
+class RecordCache:
+    '''Persists the records extracted from a data folder's XML files between runs.
+        Records are stored per file together with the file's size and modification time,
+        so only files that changed since the last run have to be parsed again'''
+    #Bump whenever the layout of the stored records changes. Caches with another version are discarded
+    formatVersion = 2
+
+    def __init__(self, dataFolder: str, cacheFolder: str = None):
+        self.__dataFolder: str = os.path.abspath(dataFolder)
+
+        if cacheFolder is None:
+            cacheFolder = self.defaultCacheFolder()
+
+        folderHash = hashlib.sha1(self.__dataFolder.encode("utf-8")).hexdigest()
+        self.__cacheFile: str = os.path.join(cacheFolder, folderHash + ".json")
+
+        self.__entries: dict = {}
+        self.__usedEntries: dict = {}
+        self.__changed: bool = False
+
+    @staticmethod
+    def defaultCacheFolder() -> str:
+        '''Returns the per-user cache folder for the editor'''
+        if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+            return os.path.join(os.environ["LOCALAPPDATA"], "PyGCEditor", "Cache")
+
+        cacheHome = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(cacheHome, "PyGCEditor")
+
+    def load(self) -> None:
+        '''Reads the cache file. A missing, unreadable or outdated cache is treated as empty'''
+        self.__entries = {}
+        self.__usedEntries = {}
+        self.__changed = False
+
+        try:
+            with open(self.__cacheFile, "r", encoding = "utf-8") as cacheFile:
+                content = json.load(cacheFile)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(content, dict):
+            return
+
+        if content.get("version") != RecordCache.formatVersion or content.get("dataFolder") != self.__dataFolder:
+            print("Discarding outdated load cache " + self.__cacheFile)
+            return
+
+        entries = content.get("files")
+        if isinstance(entries, dict):
+            self.__entries = entries
+
+    def getRecords(self, path: str):
+        '''Returns the cached records of a file, or None if the file is not cached or has changed since'''
+        signature = self.__signature(path)
+        if signature is None:
+            return None
+
+        key = os.path.abspath(path)
+        entry = self.__entries.get(key)
+        if entry is None or entry.get("signature") != signature:
+            return None
+
+        self.__usedEntries[key] = entry
+        return entry.get("records")
+
+    def setRecords(self, path: str, records) -> None:
+        '''Stores the records extracted from a file'''
+        signature = self.__signature(path)
+        if signature is None:
+            return
+
+        key = os.path.abspath(path)
+        entry = {"signature": signature, "records": records}
+        self.__entries[key] = entry
+        self.__usedEntries[key] = entry
+        self.__changed = True
+
+    def save(self) -> None:
+        '''Writes all files used since the last load to the cache file. Entries for files that are no
+            longer referenced are dropped. The file is replaced atomically so a crash cannot corrupt it'''
+        if not self.__changed and len(self.__usedEntries) == len(self.__entries):
+            return
+
+        content = {"version": RecordCache.formatVersion, "dataFolder": self.__dataFolder, "files": self.__usedEntries}
+
+        try:
+            cacheFolder = os.path.dirname(self.__cacheFile)
+            os.makedirs(cacheFolder, exist_ok = True)
+
+            handle, temporaryFile = tempfile.mkstemp(dir = cacheFolder, suffix = ".tmp")
+            try:
+                with os.fdopen(handle, "w", encoding = "utf-8") as cacheFile:
+                    json.dump(content, cacheFile)
+                os.replace(temporaryFile, self.__cacheFile)
+            except:
+                os.remove(temporaryFile)
+                raise
+        except OSError as error:
+            print("Could not write load cache " + self.__cacheFile + ": " + str(error))
+            return
+
+        self.__entries = dict(self.__usedEntries)
+        self.__changed = False
+
+    def __signature(self, path: str) -> list:
+        '''Returns the [size, mtime] of a file, or None if it does not exist'''
+        try:
+            fileStat = os.stat(path)
+        except OSError:
+            return None
+
+        return [fileStat.st_size, fileStat.st_mtime_ns]
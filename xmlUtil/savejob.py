@@ -0,0 +1,94 @@
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from xmlUtil.xmlreader import XMLReader
+from xmlUtil.xmlwriter import XMLWriter
+
+
+class SavedPlanet(NamedTuple):
+    '''Copy of the planet properties a save writes'''
+    name: str
+    containingFile: str
+    variantOf: str
+    x: float
+    y: float
+
+    @classmethod
+    def of(cls, planet) -> "SavedPlanet":
+        return cls(planet.name, planet.containingFile, planet.variantOf, planet.x, planet.y)
+
+
+class SavedTradeRoute(NamedTuple):
+    '''Copy of the trade route properties a save writes'''
+    name: str
+    start: SavedPlanet
+    end: SavedPlanet
+
+    @classmethod
+    def of(cls, tradeRoute) -> "SavedTradeRoute":
+        return cls(tradeRoute.name, SavedPlanet.of(tradeRoute.start), SavedPlanet.of(tradeRoute.end))
+
+
+class SavedCampaign(NamedTuple):
+    '''Copy of the campaign properties a save writes'''
+    name: str
+    planets: Tuple[SavedPlanet, ...]
+    tradeRoutes: Tuple[SavedTradeRoute, ...]
+
+    @classmethod
+    def of(cls, campaign) -> "SavedCampaign":
+        planets = tuple(sorted((SavedPlanet.of(p) for p in campaign.planets), key = lambda entry: entry.name))
+        tradeRoutes = tuple(sorted((SavedTradeRoute.of(t) for t in campaign.tradeRoutes), key = lambda entry: entry.name))
+        return cls(campaign.name, planets, tradeRoutes)
+
+
+class SaveJob:
+    '''Snapshot of everything a save writes, taken when the save starts. It only holds copies,
+        so run can be called on a worker thread while the game objects keep being edited'''
+    def __init__(self, xmlFolder: str, campaignFile: str, campaign: SavedCampaign,
+            newTradeRoutes: Tuple[SavedTradeRoute, ...] = (), updatedPlanetCoords: Dict[str, List[float]] = None,
+            dirtyPlanetFiles: Tuple[str, ...] = (), newPlanetVariants: Tuple[SavedPlanet, ...] = (), workers: int = 1):
+        self.__xmlFolder: str = xmlFolder
+        self.__campaignFile: str = campaignFile
+        self.__campaign: SavedCampaign = campaign
+        self.__newTradeRoutes: Tuple[SavedTradeRoute, ...] = tuple(newTradeRoutes)
+        self.__updatedPlanetCoords: Dict[str, List[float]] = {name: list(coords) for name, coords in (updatedPlanetCoords or {}).items()}
+        self.__dirtyPlanetFiles: Tuple[str, ...] = tuple(dirtyPlanetFiles)
+        self.__newPlanetVariants: Tuple[SavedPlanet, ...] = tuple(newPlanetVariants)
+        self.__workers: int = workers
+
+    def run(self, progress: Callable[[int, int, str], None] = None, isCancelled: Callable[[], bool] = None) -> List[str]:
+        '''Writes the snapshot. All files are staged before any of them is replaced, so a failed save
+        changes no file. Returns the written files, or None if the save was cancelled'''
+        writtenFiles = self.__write(progress, isCancelled)
+
+        #The written files are parsed into the cache here, so a reload after the save does not parse them on the GUI thread
+        if writtenFiles is not None:
+            XMLReader(self.__workers).parseFiles(writtenFiles)
+
+        return writtenFiles
+
+    def __write(self, progress: Callable[[int, int, str], None], isCancelled: Callable[[], bool]) -> List[str]:
+        xmlWriter = XMLWriter()
+        xmlWriter.beginTransaction()
+
+        xmlWriter.campaignWriter(self.__campaign, self.__campaignFile)
+
+        if len(self.__newTradeRoutes) > 0:
+            xmlWriter.tradeRouteWriter(self.__newTradeRoutes)
+
+        if len(self.__updatedPlanetCoords) > 0:
+            #Only files with moved planets are parsed. The trees are edited, so they are private
+            #copies and not the cached ones the GUI thread and the loader read at the same time
+            xmlReader = XMLReader()
+            planetRoots = {}
+            for file in self.__dirtyPlanetFiles:
+                fileRoot = xmlReader.parseFile(self.__xmlFolder + file, useCache = False)
+                if fileRoot is not None:
+                    planetRoots[file] = fileRoot
+
+            xmlWriter.planetCoordinatesWriter(self.__xmlFolder, planetRoots, self.__updatedPlanetCoords)
+
+        if len(self.__newPlanetVariants) > 0:
+            xmlWriter.planetVariantWriter(self.__xmlFolder, self.__newPlanetVariants)
+
+        return xmlWriter.commitTransaction(self.__workers, progress, isCancelled)
@@ -1,8 +1,12 @@
 import lxml.etree as et
+import mmap
 import os.path
+import re
+from concurrent.futures import ThreadPoolExecutor
+from gameObjects.gameObjectRepository import GameObjectRepository
 from gameObjects.planet import Planet
 from gameObjects.traderoute import TradeRoute
-from xmlUtil.xmlstructure import XMLStructure
+from xmlUtil.loadprofiler import LoadProfiler
 
 ''' XML with etree:
 
@@ -27,8 +31,16 @@ The Tree is serialized and can be manipulated in memory.
 
 class XMLReader:
     '''Provides XML read functions'''
-    def __init__(self):
-        pass
+    #Parsed trees shared by all readers, keyed by absolute path. Each entry holds the (size, mtime) the tree was parsed at
+    __parseCache: dict = {}
+    #Compiled byte patterns used by mayContainTag, keyed by tag
+    __tagPatterns: dict = {}
+
+    def __init__(self, workers: int = 1, profiler: LoadProfiler = None):
+        #Number of threads used to parse the files referenced by a metafile. lxml releases the GIL while parsing
+        self.__workers: int = max(1, workers)
+        #Counts the files parsed and bytes read
+        self.__profiler: LoadProfiler = profiler if profiler is not None else LoadProfiler(False)
 
 
     ''' Generic Python functions that are helpful for XML, should be moved to another class? '''
@@ -49,14 +61,6 @@ class XMLReader:
 
     ''' General XML file parsing '''
 
-    def parseXMLFileList(self, XMLFileList: list) -> list():
-        '''Parses a list of XML files and returns their roots as a list'''
-        rootList = []
-        for XMLFile in XMLFileList:
-            rootList.append(et.parse(XMLFile).getroot())  
-        return rootList
-
-    
     def hasTag(self, XMLRoot, XMLTag: str) -> bool:
         '''Checks if a given tag is present in a given XML root'''
         if XMLRoot.find(XMLTag) is not None:
@@ -72,10 +76,9 @@ class XMLReader:
         '''Parses a XML root and returns a Python set of all names in the XML tag given'''
         outputSet = set()
 
-        et.strip_tags(XMLRoot, et.Comment)
-
+        #Comments are skipped instead of stripped, the root may be a cached tree other threads read as well
         for child in XMLRoot.findall(XMLTag):
-            entry = self.commaReplaceInList(child.text.split())
+            entry = self.commaReplaceInList("".join(child.itertext()).split())
             outputSet.update(entry)
 
         return outputSet
@@ -99,72 +102,89 @@ class XMLReader:
         
         return fileList
 
-    def findPlanetsFiles(self, gameObjectFile: str) -> list():
-        '''Searches GameObjectFiles for all XML files with the Planet tag.
-            Returns a list of their XML roots'''
-        metaRoot = et.parse(gameObjectFile).getroot()
-        if self.isMetaFile(metaRoot):
-            fileList = self.parseMetaFile(metaRoot)
-            planetsFiles = {}
-
-            for file in fileList:
-                if not os.path.isfile(XMLStructure.dataFolder + "/XML/" + file):
-                    print(file + " not found. Continuing")
-                    continue
-
-                fileRoot = et.parse(XMLStructure.dataFolder + "/XML/" + file)
-                if self.hasTag(fileRoot, "Planet"):
-                    planetsFiles[file] = fileRoot.getroot()
-                
-            return planetsFiles
+    def findMetaFileList(self, metaFile: str) -> list():
+        '''Returns the list of XML files referenced in a metafile, or an empty list if it is not a metafile'''
+        metaTree = self.parseFile(metaFile)
+        if metaTree is not None and self.isMetaFile(metaTree.getroot()):
+            return self.parseMetaFile(metaTree.getroot())
 
-        else:
-            print("Not a meta file! findPlanetsFiles")
-
-    def findPlanetFilesAndRoots(self, gameObjectFile: str) -> list():
-        '''Searches GameObjectFiles for all XML files with the Planet tag.
-            Returns a dictionary of file names and their XML roots'''
-        metaRoot = et.parse(gameObjectFile).getroot()
-        if self.isMetaFile(metaRoot):
-            fileList = self.parseMetaFile(metaRoot)
-            planetsFiles = {}
-
-            for file in fileList:
-                fileRoot = self.parseFile(XMLStructure.dataFolder + "/XML/" + file)
-                
-                if fileRoot is not None and self.hasTag(fileRoot, "Planet"):
-                    planetsFiles[file] = fileRoot
-            
-            return planetsFiles
+        print("Not a meta file! findMetaFileList")
+        return []
 
-        else:
-            print("Not a meta file! findPlanetsFiles")
-    
-    def parseFile(self, path):
+    def parseFile(self, path, useCache: bool = True):
+        '''Parses an XML file and returns its tree, or None if it does not exist.
+            Trees are cached, so a file is only parsed again once its size or modification time changes.
+            Cached trees are shared between threads and must not be edited. Writers pass useCache = False
+            to get a private tree, which is not cached either'''
         if not os.path.isfile(path):
             print(path + " not found. Continuing")
             return None
 
-        return et.parse(path)
-
-    def findMetaFileRefs(self, metaFile: str) -> list():
-        '''Searches a metafile and returns a list of XML roots that are referenced in the metafile'''
-        metaRoot = et.parse(metaFile).getroot()
-        if self.isMetaFile(metaRoot):
-            fileList = self.parseMetaFile(metaRoot)
-            metaFileRefs = []
-
-            for file in fileList:
-                fileRoot = self.parseFile(XMLStructure.dataFolder + "/XML/" + file)
-                if fileRoot is None:
-                    continue
-                metaFileRefs.append(fileRoot.getroot())
-                
-            return metaFileRefs
-
-        else:
-            print("Not a meta file! findMetaFileRefs")  
+        absolutePath = os.path.abspath(path)
+        fileStat = os.stat(absolutePath)
+        signature = (fileStat.st_size, fileStat.st_mtime_ns)
+
+        if useCache:
+            cached = XMLReader.__parseCache.get(absolutePath)
+            if cached is not None and cached[0] == signature:
+                self.__profiler.count("parseCacheHits")
+                return cached[1]
+
+        tree = et.parse(absolutePath)
+        if useCache:
+            XMLReader.__parseCache[absolutePath] = (signature, tree)
+        self.__profiler.count("filesParsed")
+        self.__profiler.count("bytesRead", fileStat.st_size)
+        return tree
+
+    def mayContainTag(self, path: str, XMLTag: str) -> bool:
+        '''Scans the raw bytes of a file for an opening XMLTag without parsing it.
+            Returns False only if the tag certainly does not occur. Files that cannot be scanned
+            reliably (missing, empty, UTF-16 encoded) return True so that they are parsed in full'''
+        pattern = XMLReader.__tagPatterns.get(XMLTag)
+        if pattern is None:
+            pattern = re.compile(b"<" + re.escape(XMLTag.encode("ascii")) + rb"[\s/>]")
+            XMLReader.__tagPatterns[XMLTag] = pattern
+
+        try:
+            with open(path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                if size == 0:
+                    return True
+
+                self.__profiler.count("filesScanned")
+                self.__profiler.count("bytesScanned", size)
+                with mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as content:
+                    if content[:2] in (b"\xff\xfe", b"\xfe\xff"):
+                        return True
+
+                    return pattern.search(content) is not None
+        except (OSError, ValueError):
+            return True
 
+    @staticmethod
+    def clearParseCache() -> None:
+        '''Forgets all cached trees, e.g. when a different data folder is loaded'''
+        XMLReader.__parseCache.clear()
+
+    def parseFiles(self, paths: list) -> list():
+        '''Parses a list of XML files, using a thread pool if more than one worker is set.
+            Returns their trees in the same order as the paths, with None for missing files'''
+        return list(self.iterParseFiles(paths))
+
+    def iterParseFiles(self, paths: list):
+        '''Like parseFiles, but yields each tree as soon as it and all trees before it are parsed.
+            Files not parsed yet are skipped if the caller stops iterating early'''
+        if self.__workers == 1 or len(paths) < 2:
+            for path in paths:
+                yield self.parseFile(path)
+            return
+
+        executor = ThreadPoolExecutor(max_workers = self.__workers)
+        try:
+            yield from executor.map(self.parseFile, paths)
+        finally:
+            executor.shutdown(wait = True, cancel_futures = True)
 
     ''' EAW specific XML parsing '''
 
@@ -178,52 +198,88 @@ class XMLReader:
 
         return nameList
 
-    def getStartEnd(self, name: str, planetList: set, tradeRouteRoot) -> Planet:
-        '''Gets the start and end Planet objects for a trade route of name in root tradeRouteRoot and returns start, end'''
-        for element in tradeRouteRoot.iter():
-            if str(element.get("Name")).lower() == name.lower():
-                for child in element.iter():
-                    if child.tag == "Point_A":
-                        start_planet = self.getPlanet(child.text, planetList)
-                    elif child.tag == "Point_B":
-                        end_planet = self.getPlanet(child.text, planetList)
-                    
-                return start_planet, end_planet
-        
-        print("TradeRoute " + name + " not found! getStartEnd")
-    
-    def getLocation(self, name: str, XMLRoot) -> float:
-        '''Gets the galactic position tag value for an object of name in root XMLRoot and returns x, y'''
-        for element in XMLRoot.iter():
-            if str(element.get("Name")).lower() == name.lower():
-                for child in element.iter("Galactic_Position"):
-                    outputList = self.commaSepListParser(child.text)
-                    return float(outputList[0]), float(outputList[1])
-        
-        print("Planet " + name + " has no coordinates! getLocation")
-        return None;
-
-    def getVariantOfValue(self, name: str, XMLRoot) -> str:
-        for element in XMLRoot.iter():
-            if str(element.get("Name")).lower() == name.lower():
-                for child in element.iter("Variant_Of_Existing_Type"):
-                    return child.text
-        return ""
-
-    def getPlanet(self, name: str, planetList: set) -> Planet:
-        '''Finds a named planet object in a list of planet objects and returns it'''
-        for p in planetList:
-            if p.name.lower() == name.lower():
-                if p is not None:
-                    return p
-        
-        print("Planet " + name + " not found! getPlanet")
-
-    def getTradeRoute(self, name: str, tradeRouteList: set) -> TradeRoute:
-        '''Finds a traderoute object in a list of traderoute objects and returns it'''
-        for t in tradeRouteList:
-            if t.name.lower() == name.lower():
-                if t is not None:
-                    return t
-        
-        print("Trade Route " + name + " not found! getTradeRoute")
\ No newline at end of file
+    def getPlanetRecordsFromXML(self, fileName: str, XMLRoot) -> list():
+        '''Walks a planet file root once and returns a list of (name, coordinates, variantOf, fileName)
+            records for every named element. Coordinates are (x, y, z), or None if the planet has no position.
+            z is None if the position only has two components'''
+        records = []
+
+        for element in XMLRoot:
+            name = element.get("Name")
+            if name is None:
+                continue
+
+            coordinates = None
+            for child in element.iter("Galactic_Position"):
+                outputList = self.commaSepListParser(child.text)
+                z = float(outputList[2]) if len(outputList) > 2 else None
+                coordinates = float(outputList[0]), float(outputList[1]), z
+                break
+
+            if coordinates is None:
+                print("Planet " + name + " has no coordinates! getPlanetRecordsFromXML")
+
+            variantOf = ""
+            for child in element.iter("Variant_Of_Existing_Type"):
+                variantOf = child.text
+                break
+
+            records.append((name, coordinates, variantOf, fileName))
+
+        return records
+
+    def getTradeRouteRecordsFromXML(self, XMLRoot) -> list():
+        '''Walks a trade route file root once and returns a list of (name, pointA, pointB) records
+            for every named element, where the points are planet names'''
+        records = []
+
+        for element in XMLRoot:
+            name = element.get("Name")
+            if name is None:
+                continue
+
+            pointA = None
+            pointB = None
+            for child in element.iter():
+                if child.tag == "Point_A":
+                    pointA = child.text
+                elif child.tag == "Point_B":
+                    pointB = child.text
+
+            records.append((name, pointA, pointB))
+
+        return records
+
+    def getCampaignRecordsFromXML(self, XMLRoot) -> list():
+        '''Returns a list of (name, setName, planetNames, tradeRouteNames) records
+            for every campaign in a campaign file root'''
+        records = []
+
+        for campaignRoot in XMLRoot.iter("Campaign"):
+            name = campaignRoot.get("Name")
+            if name is None:
+                continue
+
+            setName = self.getValueFromXMLRoot(campaignRoot, ".//Campaign_Set")
+            planetNames = sorted(self.getListFromXMLRoot(campaignRoot, ".//Locations"))
+            tradeRouteNames = sorted(self.getListFromXMLRoot(campaignRoot, ".//Trade_Routes"))
+
+            records.append((name, setName, planetNames, tradeRouteNames))
+
+        return records
+
+    def getPlanet(self, name: str, repository: GameObjectRepository) -> Planet:
+        '''Finds a named planet object in the repository, ignoring case, and returns it'''
+        planet = repository.findPlanetIgnoreCase(name)
+        if planet is None:
+            print("Planet " + name + " not found! getPlanet")
+
+        return planet
+
+    def getTradeRoute(self, name: str, repository: GameObjectRepository) -> TradeRoute:
+        '''Finds a named traderoute object in the repository, ignoring case, and returns it'''
+        tradeRoute = repository.findTradeRouteIgnoreCase(name)
+        if tradeRoute is None:
+            print("Trade Route " + name + " not found! getTradeRoute")
+
+        return tradeRoute
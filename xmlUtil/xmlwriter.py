@@ -1,3 +1,10 @@
+import os
+import shutil
+import stat
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
 import lxml.etree as et
 from xmlUtil.xmlreader import XMLReader
 
@@ -8,6 +15,8 @@ class XMLWriter:
         self.__template = "campaignTemplate.xml"
         self.__templateTree = et.parse(self.__template)
         self.__templateRoot = self.__templateTree.getroot()
+        #Output files and the trees to write to them while a transaction is open, None otherwise
+        self.__pendingWrites: dict = None
 
     def campaignWriter(self, campaign, outputName: str) -> None:
         '''Writes a campaign to file'''
@@ -39,8 +48,9 @@ class XMLWriter:
         self.writer(tradeRoutesTree, outputName = "NewTradeRoutes.xml")
 
     def planetCoordinatesWriter(self, path, planetFilesRoots, newPlanetData):
-        '''Save updated planet coordinates'''
+        '''Save updated planet coordinates. Only files in which a planet was updated are written'''
         for file, root in planetFilesRoots.items():
+            changed = False
             for element in root.iter("Planet"):
                 name = str(element.get("Name"))
                 try:
@@ -49,25 +59,39 @@ class XMLWriter:
                         outputList = XMLReader().commaSepListParser(child.text)
                         pos_text = str(newData[0]) + ", " + str(newData[1]) + ", " + str(outputList[2])
                         child.text = pos_text
+                        changed = True
                         break
                 except(KeyError):
                     pass
-            self.writer(root, path + file)
+
+            if changed:
+                self.writer(root, path + file)
 
     def planetVariantWriter(self, path, planetVariants):
-        '''Write newly created planet variants to file'''
+        '''Write newly created planet variants to file. Each containing file is parsed and written once'''
+        variantsByFile = {}
         for planet in planetVariants:
-            filePath = path + planet.containingFile
-            
-            root = XMLReader().parseFile(filePath)
-            if root is None:
-                root = et.Element("Planets")
-            
-            planetRoot = et.SubElement(root, "Planet", Name = planet.name)
-            self.subElementText(planetRoot, "Variant_Of_Existing_Type", planet.variantOf)
-            pos_text = str(planet.x) + ", " + str(planet.y) + ", 10.0"
-            self.subElementText(planetRoot, "Galactic_Position", pos_text)
-            self.writer(et.ElementTree(root), filePath)
+            variantsByFile.setdefault(planet.containingFile, []).append(planet)
+
+        for file, variants in variantsByFile.items():
+            filePath = path + file
+
+            #The tree is edited, so it must not be the one other threads read from the parse cache.
+            #A file already written in this transaction, e.g. with moved planets, keeps those changes
+            tree = self.__pendingTree(filePath)
+            if tree is None:
+                tree = XMLReader().parseFile(filePath, useCache = False)
+            if tree is None:
+                tree = et.ElementTree(et.Element("Planets"))
+            root = tree.getroot()
+
+            for planet in variants:
+                planetRoot = et.SubElement(root, "Planet", Name = planet.name)
+                self.subElementText(planetRoot, "Variant_Of_Existing_Type", planet.variantOf)
+                pos_text = str(planet.x) + ", " + str(planet.y) + ", 10.0"
+                self.subElementText(planetRoot, "Galactic_Position", pos_text)
+
+            self.writer(tree, filePath)
 
     def createListEntry(self, inputList):
         '''creates a list string to insert into a file
@@ -86,6 +110,134 @@ class XMLWriter:
 
         return element
 
+    def beginTransaction(self) -> None:
+        '''Collects all following writes instead of writing them, until commitTransaction'''
+        self.__pendingWrites = {}
+
+    def commitTransaction(self, workers: int = 1, progress: Callable[[int, int, str], None] = None, isCancelled: Callable[[], bool] = None) -> List[str]:
+        '''Writes all files collected since beginTransaction, staging up to workers files at once.
+        Destinations are only replaced once every file was staged, so if staging fails or is cancelled,
+        no file is changed. If replacing fails, the files replaced so far are restored. Reports progress(staged, total, file) per staged file.
+        Returns the written files, or None if cancelled'''
+        pendingWrites = self.__pendingWrites
+        self.__pendingWrites = None
+
+        outputNames = list(pendingWrites.keys())
+        staged = []
+        errors = []
+
+        def stage(outputName: str) -> str:
+            if isCancelled is not None and isCancelled():
+                return None
+            return self.__stage(pendingWrites[outputName], outputName)
+
+        with ThreadPoolExecutor(max_workers = max(1, workers)) as executor:
+            futures = [executor.submit(stage, outputName) for outputName in outputNames]
+            for index, (outputName, future) in enumerate(zip(outputNames, futures)):
+                try:
+                    temporaryFile = future.result()
+                except Exception as error:
+                    errors.append(error)
+                    continue
+
+                if temporaryFile is not None:
+                    staged.append((temporaryFile, outputName))
+                    if progress is not None:
+                        progress(index + 1, len(outputNames), outputName)
+
+        cancelled = len(staged) + len(errors) < len(outputNames)
+        if cancelled or len(errors) > 0:
+            for temporaryFile, outputName in staged:
+                os.remove(temporaryFile)
+            if len(errors) > 0:
+                raise errors[0]
+            return None
+
+        #Each original is kept until every file was replaced, so a failed replace can put them all back
+        replaced = []
+        backupFile = None
+        try:
+            for index, (temporaryFile, outputName) in enumerate(staged):
+                backupFile = self.__backup(outputName)
+                os.replace(temporaryFile, outputName)
+                replaced.append((outputName, backupFile))
+                backupFile = None
+        except:
+            if backupFile is not None:
+                os.remove(backupFile)
+            for temporaryFile, outputName in staged[index:]:
+                if os.path.exists(temporaryFile):
+                    os.remove(temporaryFile)
+            self.__restore(replaced)
+            raise
+
+        for outputName, backupFile in replaced:
+            if backupFile is not None:
+                os.remove(backupFile)
+
+        return outputNames
+
     def writer(self, XMLRoot, outputName: str) -> None:
-        '''Writes XML file'''
-        XMLRoot.write(outputName, xml_declaration = "1.0", pretty_print = True)
\ No newline at end of file
+        '''Writes XML file. The file is written next to its destination first and then renamed over it,
+        so a failed write leaves the previous file intact. Inside a transaction, the write is only collected'''
+        if self.__pendingWrites is not None:
+            self.__pendingWrites[outputName] = XMLRoot
+            return
+
+        temporaryFile = self.__stage(XMLRoot, outputName)
+        os.replace(temporaryFile, outputName)
+
+    def __pendingTree(self, outputName: str):
+        '''Returns the tree the open transaction writes to outputName, or None'''
+        if self.__pendingWrites is None:
+            return None
+
+        return self.__pendingWrites.get(outputName)
+
+    def __backup(self, outputName: str) -> str:
+        '''Keeps the current content of outputName under a new name next to it and returns that name,
+        or None if outputName does not exist yet'''
+        if not os.path.exists(outputName):
+            return None
+
+        handle, backupFile = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(outputName)), suffix = ".bak")
+        os.close(handle)
+        os.remove(backupFile)
+
+        #A second link to the original is enough, replacing outputName does not touch its content
+        try:
+            os.link(outputName, backupFile)
+        except OSError:
+            shutil.copy2(outputName, backupFile)
+
+        return backupFile
+
+    def __restore(self, replaced: list) -> None:
+        '''Puts back the originals of replaced files, newest first. Files that did not exist before are removed'''
+        for outputName, backupFile in reversed(replaced):
+            try:
+                if backupFile is None:
+                    os.remove(outputName)
+                else:
+                    os.replace(backupFile, outputName)
+            except OSError as error:
+                print("Could not restore " + outputName + ": " + str(error))
+
+    def __stage(self, XMLRoot, outputName: str) -> str:
+        '''Writes XML file to a new temporary file next to outputName and returns its path'''
+        handle, temporaryFile = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(outputName)), suffix = ".tmp")
+        os.close(handle)
+
+        try:
+            #mkstemp creates the file private to the user, keep the permissions of the file it replaces
+            try:
+                os.chmod(temporaryFile, stat.S_IMODE(os.stat(outputName).st_mode))
+            except FileNotFoundError:
+                os.chmod(temporaryFile, 0o644)
+
+            XMLRoot.write(temporaryFile, xml_declaration = "1.0", pretty_print = True)
+        except:
+            os.remove(temporaryFile)
+            raise
+
+        return temporaryFile
\ No newline at end of file